@@ -1,64 +1,116 @@
 """Streamlit-based YouTube downloader GUI application."""
+import importlib.util
 import os
+import shutil
 import streamlit as st
-from pytube_helper import (
-    get_video_streams, download_video, download_audio, download_playlist,
-    PYDUB_AVAILABLE, is_ffmpeg_available, has_yt_dlp, download_fallback,
-    download_with_ytdlp
+from concurrent.futures import ProcessPoolExecutor
+from progress_store import (
+    progress_file_for_id, read_progress_file, list_progress_files,
+    write_progress_file, ensure_progress_dir,
 )
-from progress_store import progress_file_for_id, read_progress_file, list_progress_files
+import array
 import uuid
-from pytube import Playlist
 import time
+from time import perf_counter_ns
 from typing import Optional, Callable
 
 
+def _helper():
+    """Import pytube_helper on first use.
+
+    The helper pulls in pytube (and probes yt-dlp/pydub), which costs most
+    of the cold-start time; deferring it keeps the initial page render to
+    Streamlit-native widgets. After the first call it is a cached
+    sys.modules lookup.
+    """
+    import pytube_helper
+    return pytube_helper
+
+
+def _pydub_available() -> bool:
+    """Check pydub installability without importing it."""
+    return importlib.util.find_spec('pydub') is not None
+
+
+def _ffmpeg_available() -> bool:
+    """Check whether ffmpeg is on PATH (same probe the helper uses)."""
+    return shutil.which('ffmpeg') is not None
+
+
+_SPEED_UNITS = ('B/s', 'KB/s', 'MB/s', 'GB/s', 'TB/s')
+_SPEED_DIVISORS = (1, 1024, 1024 ** 2, 1024 ** 3, 1024 ** 4)
+
+
 def human_speed(bps: float) -> str:
     """Convert bytes per second to human-readable format.
-    
+
+    Branchless unit selection: the unit index is floor(log2(bps)) // 10,
+    which bit_length gives in O(1) instead of a divide-and-compare loop.
+
     Args:
         bps: Bytes per second
-        
+
     Returns:
         Human-readable speed string
     """
-    for unit in ['B/s', 'KB/s', 'MB/s', 'GB/s']:
-        if bps < 1024.0:
-            return f"{bps:3.1f}{unit}"
-        bps /= 1024.0
-    return f"{bps:.1f}TB/s"
+    i = min(max(int(bps).bit_length() - 1, 0) // 10, 4)
+    return f"{bps / _SPEED_DIVISORS[i]:3.1f}{_SPEED_UNITS[i]}"
 
-def create_progress_callback(start_time: dict, progress_bar, status_text):
+def create_progress_callback(start_time: dict, progress_bar, status_text,
+                             bytes_marker=None):
     """Create a standardized progress callback for downloads.
-    
+
     Args:
         start_time: Dict with 't' key to track start time
         progress_bar: Streamlit progress bar widget
         status_text: Streamlit text widget for status updates
-        
+        bytes_marker: Optional st.empty() placeholder; receives a hidden
+            div with data-bytes/data-total so UI tests can observe byte
+            progress via MutationObserver instead of screenshot polling
+
     Returns:
         Progress callback function
     """
+    last_emit = {'t': 0, 'pct': -1}
+
     def progress_cb(received: int, total: int):
-        now = time.time()
+        # integer-only hot path: perf_counter_ns avoids the float conversion
+        # of time.time() and all math stays in int until an emit happens
+        now_ns = perf_counter_ns()
         if start_time['t'] is None:
-            start_time['t'] = now
-        elapsed = max(now - start_time['t'], 1e-6)
-        speed = received / elapsed
-        eta = int((total - received) / speed) if speed > 0 else 0
+            start_time['t'] = now_ns
+        percent = received * 100 // total if total else 0
+        # Coalesce updates: each emit is a WebSocket round-trip and the
+        # browser can't render faster than ~10 Hz anyway.
+        if now_ns - last_emit['t'] < 100_000_000 and percent == last_emit['pct']:
+            return
+        last_emit['t'] = now_ns
+        last_emit['pct'] = percent
+        elapsed_ns = (now_ns - start_time['t']) or 1
+        speed = received * 1_000_000_000 // elapsed_ns
+        eta = (total - received) // speed if speed > 0 else 0
         try:
-            percent = int(received / total * 100)
             progress_bar.progress(min(percent, 100))
             status_text.text(
                 f"{received:,} / {total:,} bytes ({percent}%) — "
                 f"{human_speed(speed)} — ETA {eta}s"
             )
+            if bytes_marker is not None:
+                bytes_marker.markdown(
+                    f'<div id="bdone" data-bytes="{received}" data-total="{total}"'
+                    ' style="display:none"></div>',
+                    unsafe_allow_html=True)
         except Exception:
             pass
-    
+
     return progress_cb
 
 
+def _ytdlp_adapter(cb: Callable[[int, int], None]) -> Callable:
+    """Adapt a (received, total) callback to yt-dlp's 5-arg hook signature."""
+    return lambda fn, received, total, speed, eta: cb(received, total)
+
+
 def ensure_output_folder(folder: str) -> str:
     """Ensure the output folder exists.
     
@@ -79,6 +131,83 @@ def ensure_output_folder(folder: str) -> str:
     
     return folder
 
+
+@st.cache_data(ttl=600, show_spinner=False)
+def cached_playlist_urls(url: str) -> list:
+    """Fetch a playlist's video URLs once per URL (10-minute TTL).
+
+    Streamlit reruns the whole script on every widget interaction; without
+    caching each rerun re-fetches and re-parses the playlist HTML.
+    """
+    from pytube import Playlist as PTPlaylist
+    return list(PTPlaylist(url).video_urls)
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def cached_video_streams(url: str):
+    """Fetch video stream metadata once per URL (10-minute TTL).
+
+    Uses cache_resource (not cache_data) because the result holds live
+    pytube Stream objects, which should be shared by reference rather than
+    pickled.
+    """
+    return _helper().get_video_streams(url)
+
+
+@st.cache_resource(show_spinner=False)
+def get_convert_pool() -> ProcessPoolExecutor:
+    """Process pool for MP3 conversion, shared across sessions.
+
+    Conversion is ffmpeg CPU time; running it in worker processes lets the
+    download thread start the next file immediately instead of blocking for
+    2-10x the download duration.
+    """
+    return ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2))
+
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+
+def start_progress_observer(folder: str, cache: dict):
+    """Watch the progress directory and push parsed updates into `cache`.
+
+    Replaces per-rerun polling of every progress marker with an event-driven
+    update: the UI then only reads the in-memory dict.
+
+    Args:
+        folder: Base output directory (its .progress subdir is watched)
+        cache: Dict updated in place with path -> progress data
+
+    Returns:
+        The started Observer (caller keeps it for the session lifetime)
+    """
+    class _ProgressHandler(FileSystemEventHandler):
+        def on_modified(self, event):
+            if event.is_directory or not str(event.src_path).endswith('.json'):
+                return
+            cache[str(event.src_path)] = read_progress_file(str(event.src_path))
+
+        on_created = on_modified
+
+        def on_moved(self, event):
+            # terminal markers arrive as tmp-file + os.replace, which
+            # watchdog reports as a move onto the .json destination
+            if event.is_directory or not str(event.dest_path).endswith('.json'):
+                return
+            cache[str(event.dest_path)] = read_progress_file(str(event.dest_path))
+
+    observer = Observer()
+    observer.daemon = True
+    observer.schedule(_ProgressHandler(), ensure_progress_dir(folder), recursive=False)
+    observer.start()
+    return observer
+
+
 st.title('YouTube Downloader (pytube)')
 
 st.markdown('A simple GUI for downloading YouTube videos, audio, and playlists using pytube.')
@@ -109,10 +238,10 @@ except Exception:
     st.warning(f'Could not create output folder: {output_folder}. Falling back to current directory')
     output_folder = os.getcwd()
 
-if convert_mp3 and not PYDUB_AVAILABLE:
+if convert_mp3 and not _pydub_available():
     st.warning('pydub is not available. Install pydub and ffmpeg to enable MP3 conversion.')
 
-if not is_ffmpeg_available():
+if not _ffmpeg_available():
     with st.expander('ffmpeg not found (why needed & how to install)'):
         st.markdown('''
         MP3 conversion requires ffmpeg. On Windows you can install using one of these methods:
@@ -130,10 +259,11 @@ log_area = st.empty()
 def log(msg):
     log_area.text(msg)
 
-# Keep the fetched-download UI visible across reruns by caching fetched streams
+# Keep the fetched-download UI visible across reruns (stream metadata itself
+# lives in the Streamlit caches above)
 # If the user presses Start download, or we already have cached streams for the current URL,
 # render the download controls.
-show_download_ui = download_btn or (st.session_state.get('fetched_streams') and st.session_state.get('fetched_url') == url)
+show_download_ui = download_btn or st.session_state.get('fetched_url') == url
 
 if download_btn:
     # mark that we should keep the UI visible for this URL
@@ -151,86 +281,81 @@ if show_download_ui:
                 st.info('Starting playlist download...')
                 res_pref = None if resolution == 'Highest' else resolution
 
-                urls = []
-                # when concurrency ==1 we can show per-item live updates
-                items = []
                 # create placeholders
                 status_box = st.container()
 
-                downloaded = []
-
-                if concurrency == 1:
-                    # define callback to update status per item
-                    total = None
-
-                    def per_item_cb(title, status):
-                        status_box.write(f"{title}: {status}")
+                # parse the playlist once; the same URL list drives both the
+                # UI placeholders and the download workers
+                urls = cached_playlist_urls(url)
+                n = len(urls)
+                if concurrency > 1:
+                    st.caption(f'Downloading up to {concurrency} items in parallel — rows update as each item progresses.')
+                # SoA layout: parallel arrays instead of a list of dicts, so a
+                # progress update is one indexed store rather than nested
+                # hash lookups (and 'i' array slots are unboxed C ints)
+                if len(st.session_state.get('playlist_status', [])) != n:
+                    st.session_state['playlist_status'] = ['queued'] * n
+                    st.session_state['playlist_progress'] = array.array('i', [0] * n)
+                    st.session_state['playlist_text'] = [f'Item {i+1}: queued' for i in range(n)]
+                item_status = st.session_state['playlist_status']
+                item_progress = st.session_state['playlist_progress']
+                item_text = st.session_state['playlist_text']
+
+                # one table instead of 3*n widgets: the frontend diffs a single
+                # element per tick rather than patching hundreds of DOM nodes
+                import pandas as pd
+
+                table_placeholder = status_box.empty()
+
+                def _render_table():
+                    table_placeholder.dataframe(
+                        pd.DataFrame({
+                            'item': item_text,
+                            'status': item_status,
+                            'progress (%)': item_progress,
+                        }),
+                        use_container_width=True,
+                    )
+
+                _render_table()
+                table_gate = {'t': 0.0}
+
+                def per_item_cb(title, status, video_url_cb=None, index_cb=None, received=0, total=0, speed=0.0, eta=0):
+                    try:
+                        if index_cb is None:
+                            return
+                        if total and total > 0:
+                            pct = int(received / total * 100)
+                        else:
+                            pct = 0
+                        # state updates are cheap — always record them
+                        item_status[index_cb] = status
+                        item_text[index_cb] = f"{title}: {status}"
+                        item_progress[index_cb] = pct
+                        # but re-render the table at most ~10x per second
+                        now = time.time()
+                        if status == 'downloading' and now - table_gate['t'] < 0.1:
+                            return
+                        table_gate['t'] = now
+                        _render_table()
+                    except Exception:
+                        pass
 
-                    results = download_playlist(url, output_folder, resolution_preference=res_pref,
+                try:
+                    results = _helper().download_playlist(url, output_folder, resolution_preference=res_pref,
                                                 audio_only=(mode=='Audio'), convert_mp3=convert_mp3,
-                                                concurrency=1, per_item_callback=per_item_cb)
-                    st.success(f'Downloaded {len(results)} items to {output_folder}')
-                    for r in results:
-                        st.write(r)
-                else:
-                    st.warning('Parallel downloads enabled — live per-item streaming logs are limited. You will see a summary when done.')
-                    # prepare placeholders in session_state for each playlist item (with progress bars)
-                    from pytube import Playlist as PTPlaylist
-                    playlist_obj = PTPlaylist(url)
-                    urls = playlist_obj.video_urls
-                    n = len(urls)
-                    if 'playlist_items' not in st.session_state or len(st.session_state.get('playlist_items', [])) != n:
-                        st.session_state['playlist_items'] = [
-                            {'status': 'queued', 'progress': 0, 'text': f'Item {i+1}: queued'} for i in range(n)
-                        ]
-
-                    # render placeholders and progress bars
-                    item_placeholders = []
-                    for i in range(n):
-                        container = status_box.container()
-                        t = container.empty()
-                        p = container.progress(0)
-                        s = container.empty()
-                        t.text(st.session_state['playlist_items'][i]['text'])
-                        item_placeholders.append((t, p, s))
-
-                    def per_item_cb(title, status, video_url_cb, index_cb, received, total, speed, eta):
-                        try:
-                            # update state
-                            st.session_state['playlist_items'][index_cb]['status'] = status
-                            st.session_state['playlist_items'][index_cb]['text'] = f"{title}: {status}"
-                            if total and total > 0:
-                                pct = int(received / total * 100)
-                            else:
-                                pct = 0
-                            st.session_state['playlist_items'][index_cb]['progress'] = pct
-                            # update UI widgets
-                            t, p, s = item_placeholders[index_cb]
-                            t.text(st.session_state['playlist_items'][index_cb]['text'])
-                            p.progress(pct)
-                            s.text(f"{received:,} / {total:,} bytes — {human_speed(speed)} — ETA {eta}s")
-                        except Exception:
-                            pass
-
-                    try:
-                        results = download_playlist(url, output_folder, resolution_preference=res_pref,
-                                                    audio_only=(mode=='Audio'), convert_mp3=convert_mp3,
-                                                    concurrency=concurrency, per_item_callback=per_item_cb)
-                    except Exception as e:
-                        st.error(f'Playlist error: {e}')
-                        results = []
-                    st.success(f'Downloaded {len(results)} items to {output_folder}')
-                    for r in results:
-                        st.write(r)
+                                                concurrency=concurrency, per_item_callback=per_item_cb)
+                except Exception as e:
+                    st.error(f'Playlist error: {e}')
+                    results = []
+                st.success(f'Downloaded {len(results)} items to {output_folder}')
+                for r in results:
+                    st.write(r)
             else:
                 st.info('Fetching video info...')
-                # Try to reuse cached streams for the same URL to avoid disappearing UI after actions
-                if st.session_state.get('fetched_url') == url and st.session_state.get('fetched_streams'):
-                    streams = st.session_state['fetched_streams']
-                else:
-                    streams = get_video_streams(url)
-                    st.session_state['fetched_streams'] = streams
-                    st.session_state['fetched_url'] = url
+                # cached per URL, so reruns triggered by other widgets don't re-fetch
+                streams = cached_video_streams(url)
+                st.session_state['fetched_url'] = url
                 st.write(f"Title: {streams.get('title')}")
 
                 # If get_video_streams returned a yt-dlp info dict, offer only yt-dlp download path
@@ -241,19 +366,31 @@ if show_download_ui:
                             # show live progress inline if user requested; otherwise run in background
                             progress_bar = st.progress(0)
                             status_text = st.empty()
+                            bytes_marker = st.empty()
+
+                            last_emit = {'t': 0.0, 'pct': -1}
 
                             def ytdlp_progress(fn, downloaded, total, speed, eta):
                                 try:
+                                    now = time.time()
                                     pct = int(downloaded / total * 100) if total and total > 0 else 0
+                                    if now - last_emit['t'] < 0.1 and pct == last_emit['pct']:
+                                        return
+                                    last_emit['t'] = now
+                                    last_emit['pct'] = pct
                                     progress_bar.progress(min(pct, 100))
                                     status_text.text(f"{downloaded:,} / {total:,} bytes — {human_speed(speed)} — ETA {eta}s")
+                                    bytes_marker.markdown(
+                                        f'<div id="bdone" data-bytes="{downloaded}" data-total="{total}"'
+                                        ' style="display:none"></div>',
+                                        unsafe_allow_html=True)
                                 except Exception:
                                     pass
 
                             if show_live_progress:
                                 # run inline and block UI while downloading so user sees live progress
                                 try:
-                                    fname = download_with_ytdlp(url, output_folder, audio_only=False, progress_callback=ytdlp_progress)
+                                    fname = _helper().download_with_ytdlp(url, output_folder, audio_only=False, progress_callback=ytdlp_progress)
                                     st.session_state['last_download'] = fname
                                     st.success(f'Downloaded to: {fname}')
                                 except Exception as e:
@@ -266,18 +403,15 @@ if show_download_ui:
 
                                 def _bg_download():
                                     try:
-                                        fname = download_with_ytdlp(url, output_folder, audio_only=False, progress_callback=ytdlp_progress, progress_file=pf)
+                                        fname = _helper().download_with_ytdlp(url, output_folder, audio_only=False, progress_callback=ytdlp_progress, progress_file=pf)
                                         # write final status
                                         try:
-                                            write_progress = None
-                                            from progress_store import write_progress_file
                                             write_progress_file(pf, {'status': 'completed', 'filename': fname})
                                         except Exception:
                                             pass
                                         st.session_state['last_download'] = fname
                                     except Exception as e:
                                         try:
-                                            from progress_store import write_progress_file
                                             write_progress_file(pf, {'status': 'error', 'error': str(e)})
                                         except Exception:
                                             pass
@@ -290,18 +424,30 @@ if show_download_ui:
                         if st.button('Download audio now (yt-dlp)'):
                             progress_bar = st.progress(0)
                             status_text = st.empty()
+                            bytes_marker = st.empty()
+
+                            last_emit = {'t': 0.0, 'pct': -1}
 
                             def ytdlp_progress(fn, downloaded, total, speed, eta):
                                 try:
+                                    now = time.time()
                                     pct = int(downloaded / total * 100) if total and total > 0 else 0
+                                    if now - last_emit['t'] < 0.1 and pct == last_emit['pct']:
+                                        return
+                                    last_emit['t'] = now
+                                    last_emit['pct'] = pct
                                     progress_bar.progress(min(pct, 100))
                                     status_text.text(f"{downloaded:,} / {total:,} bytes — {human_speed(speed)} — ETA {eta}s")
+                                    bytes_marker.markdown(
+                                        f'<div id="bdone" data-bytes="{downloaded}" data-total="{total}"'
+                                        ' style="display:none"></div>',
+                                        unsafe_allow_html=True)
                                 except Exception:
                                     pass
 
                             if show_live_progress:
                                 try:
-                                    fname = download_with_ytdlp(url, output_folder, audio_only=True, convert_mp3=convert_mp3, progress_callback=ytdlp_progress)
+                                    fname = _helper().download_with_ytdlp(url, output_folder, audio_only=True, convert_mp3=convert_mp3, progress_callback=ytdlp_progress)
                                     st.session_state['last_download'] = fname
                                     st.success(f'Downloaded to: {fname}')
                                 except Exception as e:
@@ -311,7 +457,7 @@ if show_download_ui:
 
                                 def _bg_download_audio():
                                     try:
-                                        fname = download_with_ytdlp(url, output_folder, audio_only=True, convert_mp3=convert_mp3, progress_callback=ytdlp_progress)
+                                        fname = _helper().download_with_ytdlp(url, output_folder, audio_only=True, convert_mp3=convert_mp3, progress_callback=ytdlp_progress)
                                         st.session_state['last_download'] = fname
                                     except Exception as e:
                                         st.session_state['last_download_error'] = str(e)
@@ -350,56 +496,24 @@ if show_download_ui:
                             else:
                                 progress_bar = st.progress(0)
                                 status_text = st.empty()
+                                bytes_marker = st.empty()
 
                                 start_time = {'t': None}
-                                def progress_cb(received, total):
-                                    now = time.time()
-                                    if start_time['t'] is None:
-                                        start_time['t'] = now
-                                    elapsed = max(now - start_time['t'], 1e-6)
-                                    speed = received / elapsed
-                                    eta = int((total - received) / speed) if speed > 0 else 0
-                                    try:
-                                        percent = int(received / total * 100)
-                                        progress_bar.progress(min(percent, 100))
-                                        status_text.text(f"{received:,} / {total:,} bytes ({percent}%) — {human_speed(speed)} — ETA {eta}s")
-                                    except Exception:
-                                        pass
+                                progress_cb = create_progress_callback(start_time, progress_bar, status_text, bytes_marker)
 
                                 with st.spinner('Downloading...'):
                                     if backend == 'yt-dlp':
-                                            out = download_with_ytdlp(url, output_folder, audio_only=False, progress_callback=lambda f,r,t,s,e: progress_cb(r,t))
+                                            out = _helper().download_with_ytdlp(url, output_folder, audio_only=False, progress_callback=_ytdlp_adapter(progress_cb))
                                     elif backend == 'pytube then yt-dlp fallback':
-                                            out = download_fallback(url, output_folder, audio_only=False, progress_callback=lambda f,r,t,s,e: progress_cb(r,t))
+                                            out = _helper().download_fallback(url, output_folder, audio_only=False, progress_callback=_ytdlp_adapter(progress_cb))
                                     else:
-                                        out = download_video(stream, output_folder, progress_callback=progress_cb)
+                                        # parallel range GETs; falls back to a
+                                        # single stream if the CDN refuses ranges
+                                        out = _helper().download_video_parallel(stream, output_folder, progress_callback=progress_cb)
                                 progress_bar.progress(100)
                                 status_text.text('Completed')
                                 st.success(f'Downloaded to: {out}')
 
-                    # show active progress files for background downloads in the output folder
-                    try:
-                        pfs = list_progress_files(output_folder)
-                        if pfs:
-                            st.subheader('Background downloads')
-                            for pf in pfs:
-                                info = read_progress_file(pf)
-                                title = info.get('filename') or info.get('title') or pf
-                                status = info.get('status') or 'unknown'
-                                downloaded = info.get('downloaded') or info.get('downloaded_bytes') or 0
-                                total = info.get('total') or info.get('total_bytes') or 0
-                                if total and total > 0:
-                                    pct = int(downloaded / total * 100)
-                                else:
-                                    pct = 0
-                                st.write(f"{title}: {status} — {downloaded:,}/{total:,} bytes ({pct}%)")
-                                if status == 'completed':
-                                    st.success(f"Completed: {info.get('filename')}")
-                                if status == 'error':
-                                    st.error(f"Error: {info.get('error')}")
-                    except Exception:
-                        pass
-
                     else:
                         # Audio mode
                         audios = streams['audio']
@@ -417,32 +531,77 @@ if show_download_ui:
                             else:
                                 progress_bar = st.progress(0)
                                 status_text = st.empty()
+                                bytes_marker = st.empty()
 
                                 start_time = {'t': None}
-                                def progress_cb(received, total):
-                                    now = time.time()
-                                    if start_time['t'] is None:
-                                        start_time['t'] = now
-                                    elapsed = max(now - start_time['t'], 1e-6)
-                                    speed = received / elapsed
-                                    eta = int((total - received) / speed) if speed > 0 else 0
-                                    try:
-                                        percent = int(received / total * 100)
-                                        progress_bar.progress(min(percent, 100))
-                                        status_text.text(f"{received:,} / {total:,} bytes ({percent}%) — {human_speed(speed)} — ETA {eta}s")
-                                    except Exception:
-                                        pass
+                                progress_cb = create_progress_callback(start_time, progress_bar, status_text, bytes_marker)
 
                                 with st.spinner('Downloading audio...'):
                                     if backend == 'yt-dlp':
-                                        out = download_with_ytdlp(url, output_folder, audio_only=True, progress_callback=lambda f,r,t,s,e: progress_cb(r,t))
+                                        out = _helper().download_with_ytdlp(url, output_folder, audio_only=True, progress_callback=_ytdlp_adapter(progress_cb))
                                     elif backend == 'pytube then yt-dlp fallback':
-                                        out = download_fallback(url, output_folder, audio_only=True, convert_mp3=convert_mp3, progress_callback=lambda f,r,t,s,e: progress_cb(r,t))
+                                        out = _helper().download_fallback(url, output_folder, audio_only=True, convert_mp3=convert_mp3, progress_callback=_ytdlp_adapter(progress_cb))
                                     else:
-                                        out = download_audio(stream, output_folder, convert_mp3=convert_mp3, progress_callback=progress_cb)
+                                        # download only; MP3 conversion runs in the
+                                        # process pool so the UI is free immediately
+                                        out = _helper().download_audio(stream, output_folder, convert_mp3=convert_mp3,
+                                                             progress_callback=progress_cb, defer_convert=True)
                                 progress_bar.progress(100)
                                 status_text.text('Completed')
                                 st.success(f'Downloaded to: {out}')
+                                if backend not in ('yt-dlp', 'pytube then yt-dlp fallback') and convert_mp3:
+                                    if _pydub_available() and _ffmpeg_available():
+                                        fut = get_convert_pool().submit(_helper().convert_to_mp3, out)
+                                        st.session_state.setdefault('pending_conversions', {})[out] = fut
+                                        st.info('MP3 conversion started in background.')
+                                    else:
+                                        st.warning('MP3 conversion skipped: pydub/ffmpeg not available.')
+
+                        # report background conversions on each rerun
+                        pending = st.session_state.get('pending_conversions') or {}
+                        for src, fut in list(pending.items()):
+                            if not fut.done():
+                                st.info(f'Converting to MP3: {src}')
+                                continue
+                            try:
+                                st.success(f'MP3 ready: {fut.result()}')
+                            except Exception as e:
+                                st.error(f'MP3 conversion failed for {src}: {e}')
+                            del pending[src]
+
+                    # show active progress for background downloads in the output folder
+                    try:
+                        entries = {}
+                        if WATCHDOG_AVAILABLE:
+                            # event-driven: terminal JSON markers land in the cache as
+                            # they are written, no per-rerun directory scan + parse
+                            cache = st.session_state.setdefault('progress_cache', {})
+                            if 'progress_observer' not in st.session_state:
+                                st.session_state['progress_observer'] = start_progress_observer(output_folder, cache)
+                            entries.update(cache)
+                        # in-flight downloads live in shared memory, not on disk,
+                        # so they are merged from the (cheap) slot scan
+                        for pf in list_progress_files(output_folder):
+                            entries.setdefault(pf, None)
+                        if entries:
+                            st.subheader('Background downloads')
+                            for pf, cached_info in entries.items():
+                                info = cached_info if cached_info is not None else read_progress_file(pf)
+                                title = info.get('filename') or info.get('title') or pf
+                                status = info.get('status') or 'unknown'
+                                downloaded = info.get('downloaded') or info.get('downloaded_bytes') or 0
+                                total = info.get('total') or info.get('total_bytes') or 0
+                                if total and total > 0:
+                                    pct = int(downloaded / total * 100)
+                                else:
+                                    pct = 0
+                                st.write(f"{title}: {status} — {downloaded:,}/{total:,} bytes ({pct}%)")
+                                if status == 'completed':
+                                    st.success(f"Completed: {info.get('filename')}")
+                                if status == 'error':
+                                    st.error(f"Error: {info.get('error')}")
+                    except Exception:
+                        pass
 
                 
         except Exception as e:
@@ -1,8 +1,16 @@
+import asyncio
+import os
 import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pytube_helper import get_video_streams, download_video, download_audio
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 
 class SimpleDownloader(tk.Tk):
     def __init__(self):
@@ -26,6 +34,15 @@ class SimpleDownloader(tk.Tk):
 
         self.output_folder = '.'
 
+        # one background event loop + pooled HTTP session shared by all
+        # downloads: connections to the CDN are reused instead of opening a
+        # fresh TCP+TLS connection (and one OS thread) per download
+        self._loop = None
+        self._session = None
+        if AIOHTTP_AVAILABLE:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, daemon=True).start()
+
     def choose_output(self):
         d = filedialog.askdirectory()
         if d:
@@ -37,21 +54,56 @@ class SimpleDownloader(tk.Tk):
         if not url:
             messagebox.showerror('Error', 'Please enter a URL')
             return
-        threading.Thread(target=self._download_thread, args=(url,)).start()
+        if AIOHTTP_AVAILABLE:
+            asyncio.run_coroutine_threadsafe(self._adownload(url), self._loop)
+        else:
+            threading.Thread(target=self._download_thread, args=(url,)).start()
+
+    def _notify(self, kind, title, message):
+        """Marshal a messagebox call back onto the Tk main thread."""
+        show = messagebox.showinfo if kind == 'info' else messagebox.showerror
+        self.after(0, lambda: show(title, message))
+
+    async def _get_session(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, limit_per_host=4, keepalive_timeout=30)
+            )
+        return self._session
+
+    async def _adownload(self, url):
+        loop = asyncio.get_running_loop()
+        try:
+            # metadata extraction is blocking (pytube) — keep it off the loop
+            streams = await loop.run_in_executor(None, get_video_streams, url)
+            if self.mode.get() == 'Video':
+                stream = streams['progressive'][0] if streams['progressive'] else streams['adaptive_video'][0]
+            else:
+                stream = streams['audio'][0]
+            out = os.path.join(self.output_folder, stream.default_filename)
+            session = await self._get_session()
+            async with session.get(stream.url) as resp:
+                resp.raise_for_status()
+                with open(out, 'wb') as f:
+                    async for chunk in resp.content.iter_chunked(65536):
+                        f.write(chunk)
+            self._notify('info', 'Done', f'Downloaded: {out}')
+        except Exception as e:
+            self._notify('error', 'Error', str(e))
 
     def _download_thread(self, url):
+        # fallback path when aiohttp is not installed
         try:
             streams = get_video_streams(url)
             if self.mode.get() == 'Video':
                 stream = streams['progressive'][0] if streams['progressive'] else streams['adaptive_video'][0]
                 out = download_video(stream, self.output_folder)
-                messagebox.showinfo('Done', f'Downloaded: {out}')
             else:
                 stream = streams['audio'][0]
                 out = download_audio(stream, self.output_folder)
-                messagebox.showinfo('Done', f'Downloaded: {out}')
+            self._notify('info', 'Done', f'Downloaded: {out}')
         except Exception as e:
-            messagebox.showerror('Error', str(e))
+            self._notify('error', 'Error', str(e))
 
 
 if __name__ == '__main__':
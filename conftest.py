@@ -0,0 +1,12 @@
+"""Put the repository root on sys.path once, before test collection.
+
+Centralizing the shim here means the scripts no longer mutate sys.path
+at import time (each insertion invalidates the import caches); they keep
+a __main__-guarded copy for standalone invocation only.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
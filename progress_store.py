@@ -1,52 +1,300 @@
-"""Progress tracking utilities for download operations."""
+"""Progress tracking utilities for download operations.
+
+Live progress is published through a shared-memory ring buffer so that a
+download emitting hundreds of callbacks per second does not pay a
+write+rename syscall per tick. Each active download occupies one fixed-size
+packed slot (uid, downloaded, total, status, speed); writers pack into their
+slot and readers unpack without any locking (single writer per slot).
+
+JSON files are kept only as persistent markers for terminal states
+('completed'/'error'), so the on-disk layout and the public API are unchanged
+for callers that poll progress files.
+"""
+import atexit
+import functools
 import os
 import json
+import hashlib
+import sqlite3
+import struct
+import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# One slot per active download: 16-byte uid prefix, downloaded bytes,
+# total bytes, status code, speed (bytes/sec).
+_RECORD = struct.Struct('=16sQQBf')
+_SLOTS = 64
+_SHM_NAME = 'pytube_progress'
+
+_STATUS_EMPTY = 0
+_STATUS_CODES = {'downloading': 1, 'completed': 2, 'error': 3}
+_STATUS_NAMES = {v: k for k, v in _STATUS_CODES.items()}
+_TERMINAL_STATUSES = ('completed', 'error')
+
+_shm = None
+_shm_created = False
+
+# last downloaded-byte count written per path (JSON fallback path only)
+_last_written: Dict[str, int] = {}
+
+
+def _get_shm():
+    """Attach to (or create) the shared progress segment.
+
+    Returns:
+        A SharedMemory instance, or None if shared memory is unavailable
+        (callers fall back to plain JSON files).
+    """
+    global _shm, _shm_created
+    if _shm is not None:
+        return _shm
+    try:
+        from multiprocessing import shared_memory
+        size = _SLOTS * _RECORD.size
+        try:
+            _shm = shared_memory.SharedMemory(_SHM_NAME, create=True, size=size)
+            _shm_created = True
+        except FileExistsError:
+            _shm = shared_memory.SharedMemory(_SHM_NAME)
+    except Exception as e:
+        logger.debug(f'Shared-memory progress store unavailable: {e}')
+        return None
+    return _shm
+
+
+def _cleanup_shm():
+    """Release the shared segment on interpreter exit (unlink if we own it)."""
+    global _shm
+    if _shm is None:
+        return
+    try:
+        _shm.close()
+        if _shm_created:
+            _shm.unlink()
+    except Exception:
+        pass
+    _shm = None
+
+
+atexit.register(_cleanup_shm)
+
+
+def _uid_key(uid: str) -> bytes:
+    """Fixed 16-byte key for a download uid (truncated, NUL-padded)."""
+    return uid.encode('utf-8', 'replace')[:16].ljust(16, b'\0')
+
+
+def _slot_for_key(key: bytes) -> int:
+    """Map a uid key to a ring slot (stable across processes)."""
+    return int.from_bytes(hashlib.md5(key).digest()[:8], 'big') % _SLOTS
 
+
+def _uid_from_path(path: str) -> str:
+    """Derive the download uid from a progress file path."""
+    return Path(path).stem
+
+
+def _write_slot(uid: str, data: Dict[str, Any]) -> bool:
+    """Pack a progress update into the uid's shared-memory slot.
+
+    Returns:
+        True if the update was published, False if shared memory is
+        unavailable.
+    """
+    shm = _get_shm()
+    if shm is None:
+        return False
+    key = _uid_key(uid)
+    slot = _slot_for_key(key)
+    status = _STATUS_CODES.get(data.get('status', 'downloading'), _STATUS_EMPTY)
+    _RECORD.pack_into(
+        shm.buf, slot * _RECORD.size,
+        key,
+        int(data.get('downloaded', 0)),
+        int(data.get('total', 0)),
+        status,
+        float(data.get('speed', 0.0)),
+    )
+    return True
+
+
+def _read_slot(uid: str) -> Dict[str, Any]:
+    """Unpack the uid's slot into a progress dict (empty if absent/stale)."""
+    shm = _get_shm()
+    if shm is None:
+        return {}
+    key = _uid_key(uid)
+    slot = _slot_for_key(key)
+    stored_key, downloaded, total, status, speed = _RECORD.unpack_from(
+        shm.buf, slot * _RECORD.size)
+    if status == _STATUS_EMPTY or stored_key != key:
+        return {}
+    return {
+        'status': _STATUS_NAMES.get(status, 'downloading'),
+        'downloaded': downloaded,
+        'total': total,
+        'speed': speed,
+    }
+
+
+def _clear_slot(uid: str) -> None:
+    """Zero the uid's slot (download reached a terminal state)."""
+    shm = _get_shm()
+    if shm is None:
+        return
+    slot = _slot_for_key(_uid_key(uid))
+    shm.buf[slot * _RECORD.size:(slot + 1) * _RECORD.size] = b'\0' * _RECORD.size
+
+
+@functools.lru_cache(maxsize=8)
 def ensure_progress_dir(output_folder: str) -> str:
     """Create and return the progress directory path.
-    
+
+    Cached per output folder so repeated calls (one per playlist item)
+    skip the mkdir syscall after the first.
+
     Args:
         output_folder: Base output directory
-        
+
     Returns:
         Path to the progress directory
     """
-    p = Path(output_folder) / '.progress'
-    p.mkdir(parents=True, exist_ok=True)
-    return str(p)
+    d = os.path.join(output_folder, '.progress')
+    os.makedirs(d, exist_ok=True)
+    return d
 
 
 def progress_file_for_id(output_folder: str, uid: str) -> str:
     """Get the progress file path for a given download ID.
-    
+
     Args:
         output_folder: Base output directory
         uid: Unique identifier for the download
-        
+
     Returns:
         Full path to the progress file
     """
-    d = ensure_progress_dir(output_folder)
-    return os.path.join(d, f'{uid}.json')
+    return ensure_progress_dir(output_folder) + os.sep + uid + '.json'
 
 
-def write_progress_file(path: str, data: Dict[str, Any]) -> None:
-    """Write progress data to a file atomically.
-    
-    Args:
-        path: Path to the progress file
-        data: Progress data dictionary to write
+@functools.lru_cache(maxsize=8)
+def _progress_db(progress_dir: str) -> Optional[sqlite3.Connection]:
+    """Open (or create) the per-folder progress database.
+
+    One SQLite file in WAL mode replaces the pile of per-download JSON
+    markers: lookups are indexed instead of O(historical files), and WAL
+    lets download threads write while the UI reads without blocking.
+
+    Returns:
+        A connection usable from any thread, or None if SQLite fails
+        (callers fall back to JSON markers).
+    """
+    try:
+        db = sqlite3.connect(os.path.join(progress_dir, 'progress.sqlite'),
+                             isolation_level=None, check_same_thread=False)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS progress('
+            'uid TEXT PRIMARY KEY, status TEXT, downloaded INT, total INT, '
+            'filename TEXT, error TEXT, updated REAL)'
+        )
+        return db
+    except Exception as e:
+        logger.debug(f'Progress database unavailable in {progress_dir}: {e}')
+        return None
+
+
+def _write_db_record(path: str, data: Dict[str, Any]) -> bool:
+    """Persist a terminal state to the progress database.
+
+    Returns:
+        True on success, False if the database is unavailable.
+    """
+    db = _progress_db(os.path.dirname(path))
+    if db is None:
+        return False
+    try:
+        db.execute(
+            'INSERT OR REPLACE INTO progress VALUES (?,?,?,?,?,?,?)',
+            (
+                _uid_from_path(path),
+                data.get('status'),
+                int(data.get('downloaded', 0)),
+                int(data.get('total', 0) or 0),
+                data.get('filename'),
+                data.get('error'),
+                time.time(),
+            ),
+        )
+        return True
+    except Exception as e:
+        logger.debug(f'Failed to record progress in database: {e}')
+        return False
+
+
+def _read_db_record(path: str) -> Dict[str, Any]:
+    """Look up a terminal state in the progress database."""
+    db = _progress_db(os.path.dirname(path))
+    if db is None:
+        return {}
+    try:
+        row = db.execute(
+            'SELECT status, downloaded, total, filename, error FROM progress WHERE uid = ?',
+            (_uid_from_path(path),),
+        ).fetchone()
+    except Exception as e:
+        logger.debug(f'Failed to read progress from database: {e}')
+        return {}
+    if row is None:
+        return {}
+    status, downloaded, total, filename, error = row
+    info: Dict[str, Any] = {'status': status, 'downloaded': downloaded, 'total': total}
+    if filename:
+        info['filename'] = filename
+    if error:
+        info['error'] = error
+    return info
+
+
+def _write_json_file(path: str, data: Dict[str, Any], atomic: bool = True) -> None:
+    """Write a JSON progress marker.
+
+    Atomic (tmp + rename) writes are reserved for terminal states, where a
+    torn file would be mistaken for a lost download. Intermediate updates
+    are written in place: losing one to a crash is harmless and skipping
+    the rename halves the syscalls per write.
     """
+    if not atomic:
+        try:
+            if ORJSON_AVAILABLE:
+                with open(path, 'wb') as f:
+                    f.write(orjson.dumps(data))
+            else:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+        except Exception as e:
+            logger.error(f'Failed to write progress file {path}: {e}')
+        return
     tmp = path + '.tmp'
     try:
-        with open(tmp, 'w', encoding='utf-8') as f:
-            json.dump(data, f)
+        if ORJSON_AVAILABLE:
+            # orjson serializes small dicts several times faster than stdlib
+            # json and emits bytes directly, skipping the text-encode step
+            with open(tmp, 'wb') as f:
+                f.write(orjson.dumps(data))
+        else:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
         os.replace(tmp, path)
     except Exception as e:
         logger.error(f'Failed to write progress file {path}: {e}')
@@ -57,33 +305,107 @@ def write_progress_file(path: str, data: Dict[str, Any]) -> None:
             pass
 
 
+def write_progress_file(path: str, data: Dict[str, Any]) -> None:
+    """Publish a progress update for the download identified by `path`.
+
+    Intermediate updates go to the shared-memory slot only (no file I/O);
+    terminal states ('completed'/'error') are additionally persisted as a
+    JSON marker file so they survive the process.
+
+    Args:
+        path: Path to the progress file (its stem is the download uid)
+        data: Progress data dictionary to write
+    """
+    uid = _uid_from_path(path)
+    if data.get('status') in _TERMINAL_STATUSES:
+        # the database row is the indexed store; the JSON marker is still
+        # written so directory watchers (the app's progress observer) get
+        # a filesystem event and out-of-process pollers can read the file
+        _write_db_record(path, data)
+        _write_json_file(path, data, atomic=True)
+        _clear_slot(uid)
+        _last_written.pop(path, None)
+        return
+    if not _write_slot(uid, data):
+        # shared memory unavailable — fall back to the JSON file; drop
+        # updates that moved less than 1% since the last write
+        downloaded = int(data.get('downloaded', 0))
+        total = int(data.get('total', 0) or 0)
+        last = _last_written.get(path)
+        if last is not None and total and abs(downloaded - last) < total // 100:
+            return
+        _last_written[path] = downloaded
+        _write_json_file(path, data, atomic=False)
+
+
 def read_progress_file(path: str) -> Dict[str, Any]:
-    """Read progress data from a file.
-    
+    """Read progress data for the download identified by `path`.
+
+    The shared-memory slot is consulted first — for an active download
+    that is a lock-free unpack with no syscall, where the file check costs
+    a stat per poll. Slots are cleared on terminal writes, so a non-empty
+    slot is never stale; terminal states resolve through the JSON marker
+    or the database.
+
     Args:
         path: Path to the progress file
-        
+
     Returns:
-        Progress data dictionary, or empty dict if read fails
+        Progress data dictionary, or empty dict if nothing is known
     """
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        logger.debug(f'Failed to read progress file {path}: {e}')
-        return {}
+    info = _read_slot(_uid_from_path(path))
+    if info:
+        return info
+    if os.path.exists(path):
+        try:
+            if ORJSON_AVAILABLE:
+                with open(path, 'rb') as f:
+                    return orjson.loads(f.read())
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.debug(f'Failed to read progress file {path}: {e}')
+            return {}
+    return _read_db_record(path)
 
 
 def list_progress_files(output_folder: str) -> List[str]:
-    """List all progress files in the output folder.
-    
+    """List progress entries (terminal JSON markers plus active slots).
+
     Args:
         output_folder: Base output directory
-        
+
     Returns:
-        List of progress file paths
+        List of progress file paths; paths for in-flight downloads may not
+        exist on disk but resolve through `read_progress_file`.
     """
-    d = Path(output_folder) / '.progress'
-    if not d.exists():
+    d = os.path.join(output_folder, '.progress')
+    try:
+        # scandir: one readdir pass, cached dtype, no Path allocation per entry
+        with os.scandir(d) as it:
+            paths = [e.path for e in it if e.name.endswith('.json') and e.is_file()]
+    except FileNotFoundError:
         return []
-    return [str(p) for p in d.glob('*.json')]
+    seen = {os.path.basename(p)[:-5] for p in paths}
+    shm = _get_shm()
+    if shm is not None:
+        for slot in range(_SLOTS):
+            key, _, _, status, _ = _RECORD.unpack_from(shm.buf, slot * _RECORD.size)
+            if status == _STATUS_EMPTY:
+                continue
+            uid = key.rstrip(b'\0').decode('utf-8', 'replace')
+            if uid and uid not in seen:
+                seen.add(uid)
+                paths.append(os.path.join(d, f'{uid}.json'))
+    db = _progress_db(d)
+    if db is not None:
+        try:
+            # only recent terminal entries: O(active) instead of O(historical)
+            rows = db.execute('SELECT uid FROM progress WHERE updated > ?',
+                              (time.time() - 3600,)).fetchall()
+        except Exception:
+            rows = []
+        for (uid,) in rows:
+            if uid not in seen:
+                paths.append(os.path.join(d, f'{uid}.json'))
+    return paths
@@ -1,77 +1,538 @@
+import atexit
+import functools
+import importlib.util
+import io
+import json
 import os
+import queue
+import random
+import re
+import socket
+import subprocess
 import tempfile
 import shutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from pytube import YouTube, Playlist
-from pytube.cli import on_progress
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import chain
 from typing import Callable, Optional, List, Dict, Tuple, Any
 import time
 import math
 from urllib.parse import urlparse, parse_qs
+from urllib.error import URLError, HTTPError
 import logging
 
+from progress_store import write_progress_file, progress_file_for_id
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 # Constants
 DEFAULT_MAX_RETRIES = 2
 DEFAULT_BACKOFF_FACTOR = 1.5
 DEFAULT_CONCURRENCY = 3
 SAFE_FILENAME_CHARS = " ._-()[]"
 
+# Everything _safe_filename deletes, as one compiled character class:
+# \w covers unicode letters/digits (plus underscore, which is in the safe
+# set anyway), so a single C-level sub() replaces the per-character
+# Python loop across the whole codepoint range.
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w .\-()\[\]]+')
+
+# Set to stop retry backoff waits immediately instead of sleeping them out.
+_shutdown_event = threading.Event()
+
+
+def cancel_all_downloads() -> None:
+    """Wake any workers waiting in retry backoff so they bail out.
+
+    Transfers already in flight finish their current attempt; only the
+    retry waits are interruptible.
+    """
+    _shutdown_event.set()
+
+
+def reset_cancellation() -> None:
+    """Clear a previous :func:`cancel_all_downloads` so new downloads run."""
+    _shutdown_event.clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_ytdlp():
+    """Import yt_dlp on first use.
+
+    Importing yt_dlp pulls in hundreds of submodules (~0.5s); callers that
+    stay on the pytube backend should not pay that at import time.
+
+    Returns:
+        The yt_dlp module, or None if it is not installed.
+    """
+    try:
+        import yt_dlp
+    except ImportError:
+        return None
+    return yt_dlp
+
+
+# Long-lived YoutubeDL instances for extraction-only call sites, one per
+# distinct opts signature *per thread*. Constructing YoutubeDL
+# re-initializes extractors and a fresh HTTP pool every time; reusing an
+# instance keeps TLS connections and lazily-loaded extractors warm across
+# calls. YoutubeDL is not thread-safe (mutable extractor/result state,
+# cookie jar), so the batch/prefetch fan-outs must not share one instance:
+# thread-local pooling keeps the reuse without serializing extraction
+# behind a lock. Download call sites are excluded: their progress hooks
+# differ per item and mutating a shared instance's hooks would cross-wire
+# concurrent transfers.
+_ydl_tls = threading.local()
+
+
+def _get_ydl(ydl_opts: Dict[str, Any]):
+    """Return this thread's pooled YoutubeDL for the (hook-free) opts dict."""
+    pool = getattr(_ydl_tls, 'pool', None)
+    if pool is None:
+        pool = _ydl_tls.pool = {}
+    key = json.dumps(ydl_opts, sort_keys=True, default=str)
+    ydl = pool.get(key)
+    if ydl is None:
+        ydl = _get_ytdlp().YoutubeDL(ydl_opts)
+        if hasattr(ydl, 'close'):
+            atexit.register(ydl.close)
+        pool[key] = ydl
+    return ydl
+
+
+@functools.lru_cache(maxsize=1)
+def _get_audiosegment():
+    """Import pydub's AudioSegment on first use (None if unavailable)."""
+    try:
+        from pydub import AudioSegment
+    except ImportError:
+        return None
+    return AudioSegment
+
+
 try:
-    import yt_dlp
-    YTDLP_AVAILABLE = True
+    import diskcache
+    DISKCACHE_AVAILABLE = True
 except ImportError:
-    YTDLP_AVAILABLE = False
+    DISKCACHE_AVAILABLE = False
 
 try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
 except ImportError:
-    PYDUB_AVAILABLE = False
+    AIOHTTP_AVAILABLE = False
+
+
+def _build_http_session() -> requests.Session:
+    """Build the shared pooled HTTP session used for direct transfers.
+
+    A single Session with a sized connection pool means parallel downloads
+    reuse TCP+TLS connections to the CDN instead of paying a handshake per
+    file/segment. The pool is sized well above the worst case of
+    playlist workers times range connections per transfer, and
+    pool_block=False keeps a burst from stalling workers — an overflow
+    connection is simply not kept alive afterwards.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        pool_block=False,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+# Shared across all download entry points (threads included: requests.Session
+# is thread-safe for concurrent gets).
+HTTP_SESSION = _build_http_session()
+
+
+class _PooledResponse:
+    """Minimal urlopen-style wrapper around a streamed requests response.
+
+    pytube only ever calls `.read()`/`.read(n)` and `.info()` on what
+    `_execute_request` returns, so this adapter is all that's needed to
+    serve it from the pooled session.
+    """
+
+    def __init__(self, resp: requests.Response):
+        self._resp = resp
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._resp.raw.read(amt, decode_content=True)
+
+    def info(self):
+        return self._resp.headers
+
+
+# Conditional-GET cache for static assets (base.js). YouTube serves the
+# player JS with a strong ETag, so revalidating with If-None-Match turns
+# the repeated ~1 MB fetch into an empty-body 304 answered from here.
+_etag_lock = threading.Lock()
+_etag_cache: Dict[str, Tuple[str, bytes, Any]] = {}
+
+
+class _CachedBody:
+    """read()/info() view over a body revalidated via If-None-Match."""
+
+    def __init__(self, body: bytes, headers):
+        self._buf = io.BytesIO(body)
+        self._headers = headers
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._buf.read(amt)
+
+    def info(self):
+        return self._headers
+
+
+def _pooled_execute_request(url, method=None, headers=None, data=None,
+                            timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    """Drop-in replacement for pytube.request._execute_request.
+
+    Routes every pytube round-trip (innertube JSON, base.js, range GETs)
+    through the shared pooled session, so repeated calls reuse kept-alive
+    TCP+TLS connections instead of paying a handshake per urlopen. Errors
+    are translated back to the urllib exceptions pytube expects.
+    """
+    base_headers = {'User-Agent': 'Mozilla/5.0', 'accept-language': 'en-US,en'}
+    if headers:
+        base_headers.update(headers)
+    if data is not None and not isinstance(data, bytes):
+        data = json.dumps(data).encode('utf-8')
+    if not url.lower().startswith('http'):
+        raise ValueError('Invalid URL')
+    # only plain GETs for the static player JS are worth revalidating;
+    # ranged media GETs and innertube POSTs never repeat byte-identically
+    cacheable = (data is None and (method or 'GET') == 'GET'
+                 and url.split('?', 1)[0].endswith('.js'))
+    cached = None
+    if cacheable:
+        with _etag_lock:
+            cached = _etag_cache.get(url)
+        if cached:
+            base_headers['If-None-Match'] = cached[0]
+    try:
+        resp = HTTP_SESSION.request(
+            method or ('POST' if data else 'GET'), url,
+            headers=base_headers, data=data, stream=True,
+            timeout=None if timeout is socket._GLOBAL_DEFAULT_TIMEOUT else timeout,
+        )
+    except requests.exceptions.Timeout as e:
+        # pytube's retry loop keys on URLError(reason=socket.timeout)
+        raise URLError(socket.timeout(str(e)))
+    except requests.exceptions.RequestException as e:
+        raise URLError(e)
+    if resp.status_code == 304 and cached is not None:
+        resp.close()
+        return _CachedBody(cached[1], cached[2])
+    if resp.status_code >= 400:
+        raise HTTPError(url, resp.status_code, resp.reason,
+                        resp.headers, io.BytesIO(resp.content))
+    if cacheable and resp.status_code == 200:
+        etag = resp.headers.get('ETag')
+        if etag:
+            body = resp.content
+            with _etag_lock:
+                if len(_etag_cache) > 8:
+                    # player JS rotates; don't hoard stale megabyte blobs
+                    _etag_cache.clear()
+                _etag_cache[url] = (etag, body, resp.headers)
+            return _CachedBody(body, resp.headers)
+    return _PooledResponse(resp)
+
+
+# Process-global cipher cache. pytube already caches the base.js *source*
+# per process, but re-runs the expensive regex parse (Cipher construction)
+# on every stream-manifest resolution; the parsed result only changes when
+# YouTube ships a new base.js, so share it per js blob instead.
+_cipher_lock = threading.Lock()
+_cipher_cache: Dict[int, Any] = {}
+_real_cipher = None  # set by _init_pytube()
+
+
+def _shared_cipher(js: str):
+    """Return a shared parsed Cipher for this base.js blob.
+
+    Keyed on hash(js): pytube hands the same cached js string object to
+    every call, so the hash is computed once and hits thereafter.
+    """
+    key = hash(js)
+    cipher = _cipher_cache.get(key)
+    if cipher is None:
+        with _cipher_lock:
+            cipher = _cipher_cache.get(key)
+            if cipher is None:
+                cipher = _real_cipher(js=js)
+                if len(_cipher_cache) > 4:
+                    # base.js rotates daily; don't hold stale parses forever
+                    _cipher_cache.clear()
+                _cipher_cache[key] = cipher
+    return cipher
+
+
+@functools.lru_cache(maxsize=1)
+def _init_pytube():
+    """Import pytube on first use and install the performance patches.
+
+    Deferring the import keeps `import pytube_helper` light for callers
+    (including the unit tests) that only touch the pure helpers; the
+    pooled-request shim, shared cipher, and larger range size are applied
+    exactly once, before any pytube call can run.
+    """
+    global _real_cipher
+    import pytube.request
+    import pytube.extract
+    from pytube import YouTube, Playlist
+    from pytube.cli import on_progress
+    # Fetch 10 MB ranges instead of pytube's 9 MB default so range-request
+    # count and per-request overhead drop slightly on large files.
+    pytube.request.default_range_size = 10 * 1024 * 1024
+    pytube.request._execute_request = _pooled_execute_request
+    _real_cipher = pytube.extract.Cipher
+    pytube.extract.Cipher = _shared_cipher
+    return YouTube, Playlist, on_progress
+
+
+class _ProgressWriter:
+    """Debounced, off-thread publisher for progress updates.
+
+    Download callbacks fire many times per second; writing the progress
+    store on every tick puts file/DB I/O in the transfer hot path. Updates
+    are dropped unless ~250ms have passed for that path, and surviving ones
+    are handed to a single background thread so download threads never
+    block on the store. Terminal states bypass both: they are written
+    synchronously so completion is never lost to the debounce or to
+    process exit.
+    """
+
+    _MIN_INTERVAL = 0.25
+
+    def __init__(self):
+        self._queue: 'queue.SimpleQueue' = queue.SimpleQueue()
+        self._last_write: Dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    t = threading.Thread(target=self._drain, daemon=True,
+                                         name='progress-writer')
+                    t.start()
+                    self._thread = t
+
+    def _drain(self) -> None:
+        while True:
+            path, data = self._queue.get()
+            try:
+                write_progress_file(path, data)
+            except Exception as e:
+                logger.warning(f'Failed to write progress file: {e}')
+
+    def write(self, path: str, data: Dict[str, Any]) -> None:
+        if data.get('status') in ('completed', 'error'):
+            self._last_write.pop(path, None)
+            write_progress_file(path, data)
+            return
+        now = time.monotonic()
+        if now - self._last_write.get(path, 0.0) < self._MIN_INTERVAL:
+            return
+        self._last_write[path] = now
+        self._ensure_thread()
+        self._queue.put((path, data))
+
+
+_progress_writer = _ProgressWriter()
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_path() -> Optional[str]:
+    """Resolve the ffmpeg executable once per process.
+
+    Memoized: the PATH scan stats every directory in $PATH and the answer
+    does not change while the process runs, yet this is consulted on every
+    audio download.
+    """
+    return shutil.which('ffmpeg')
 
 
 def is_ffmpeg_available() -> bool:
     """Check whether ffmpeg is on PATH (used by pydub)."""
-    return shutil.which('ffmpeg') is not None
+    return _ffmpeg_path() is not None
 
 
-# module logger
+# module logger; configuring handlers/levels is left to the application
 logger = logging.getLogger(__name__)
-if not logger.handlers:
-    # basic configuration for local debugging
-    logging.basicConfig(level=logging.INFO)
 
 
+def _res_key(s) -> int:
+    """Numeric sort key for a stream's resolution ('1080p' -> 1080)."""
+    return int(s.resolution[:-1]) if s.resolution else 0
+
+
+def _abr_key(s) -> int:
+    """Numeric sort key for a stream's audio bitrate ('128kbps' -> 128)."""
+    return int(s.abr[:-4]) if s.abr else 0
+
+
+# Video ids are exactly 11 chars of [A-Za-z0-9_-]; one compiled pattern
+# covers the watch, youtu.be and shorts URL forms.
+_VIDEO_ID_RE = re.compile(r'(?:[?&]v=|youtu\.be/|/shorts/)([A-Za-z0-9_-]{11})')
+
+
+@functools.lru_cache(maxsize=4096)
 def _normalize_video_url(url: str) -> str:
     """Normalize many YouTube URL forms to https://www.youtube.com/watch?v=<id>.
 
     This strips extra query params (for example `?si=...`) which can cause pytube's
     innertube requests to fail with HTTP 400 on some URLs (observed with youtu.be links).
+
+    A single regex search replaces the urlparse/parse_qs pair, which
+    allocated a ParseResult plus a query dict per call just to pull out an
+    11-character id. Memoized: playlist runs and retries re-normalize the
+    same URLs many times, and the function is a pure string transform.
     """
+    m = _VIDEO_ID_RE.search(url)
+    if m:
+        return f'https://www.youtube.com/watch?v={m.group(1)}'
+    return url
+
+
+# Disk-backed metadata cache: a YouTube() construction costs several HTTP
+# round-trips (innertube + base.js), which dominates wall time for repeat
+# views, retries and re-opened playlists.
+_META_CACHE_EXPIRE = 86400
+_meta_cache = diskcache.Cache(os.path.join('.cache', 'pytube_meta')) if DISKCACHE_AVAILABLE else None
+
+# In-process TTL cache in front of the disk cache. Serves repeated lookups
+# for the same URL (retries, re-renders, download-after-listing) from memory
+# and keeps live Stream objects, which the pickling disk layer cannot hold.
+_STREAMS_TTL = 600
+_streams_lock = threading.Lock()
+_streams_memcache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _memcache_get(norm_url: str) -> Optional[Dict[str, Any]]:
+    entry = _streams_memcache.get(norm_url)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _memcache_put(norm_url: str, result: Dict[str, Any]) -> None:
+    now = time.monotonic()
+    with _streams_lock:
+        if len(_streams_memcache) > 256:
+            # drop expired entries before growing further
+            for k in [k for k, (exp, _) in _streams_memcache.items() if exp <= now]:
+                del _streams_memcache[k]
+        _streams_memcache[norm_url] = (now + _STREAMS_TTL, result)
+
+
+def clear_metadata_cache() -> None:
+    """Drop all cached video metadata (memory and disk layers)."""
+    with _streams_lock:
+        _streams_memcache.clear()
+    if _meta_cache is not None:
+        _meta_cache.clear()
+
+
+class CachedStream:
+    """Lightweight stand-in for a pytube Stream, built from cached metadata.
+
+    Carries the fields the UI and download paths actually use (itag,
+    resolution, abr, mime_type, url, filesize) and can download itself over
+    the shared HTTP session, so cache hits never touch pytube.
+    """
+
+    def __init__(self, title: str, itag: int, resolution: Optional[str],
+                 abr: Optional[str], mime_type: Optional[str], url: str,
+                 filesize: Optional[int]):
+        self.title = title
+        self.itag = itag
+        self.resolution = resolution
+        self.abr = abr
+        self.mime_type = mime_type
+        self.url = url
+        self.filesize = filesize
+
+    @property
+    def default_filename(self) -> str:
+        ext = self.mime_type.split('/')[-1] if self.mime_type else 'mp4'
+        return f'{_safe_filename(self.title)}.{ext}'
+
+    def download(self, output_path: str = '.', filename: Optional[str] = None) -> str:
+        name = filename or self.default_filename
+        os.makedirs(output_path, exist_ok=True)
+        out = os.path.join(output_path, name)
+        with HTTP_SESSION.get(self.url, stream=True, timeout=60) as resp:
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            with open(out, 'wb') as f:
+                # byte-for-byte passthrough: let copyfileobj shuttle large
+                # buffers instead of a Python-level per-chunk loop
+                shutil.copyfileobj(resp.raw, f, length=8 * 1024 * 1024)
+        return out
+
+
+def _stream_meta(title: str, s) -> Dict[str, Any]:
+    """Serializable subset of a pytube Stream (Streams don't pickle)."""
+    return {
+        'title': title,
+        'itag': s.itag,
+        'resolution': getattr(s, 'resolution', None),
+        'abr': getattr(s, 'abr', None),
+        'mime_type': getattr(s, 'mime_type', None),
+        'url': s.url,
+        'filesize': getattr(s, 'filesize', None),
+    }
+
+
+def _cache_video_streams(norm_url: str, result: Dict[str, Any]) -> None:
+    """Store the serializable metadata for a successful pytube fetch."""
+    if _meta_cache is None:
+        return
+    try:
+        title = result['title']
+        _meta_cache.set(norm_url, {
+            'title': title,
+            'progressive': [_stream_meta(title, s) for s in result['progressive']],
+            'adaptive_video': [_stream_meta(title, s) for s in result['adaptive_video']],
+            'audio': [_stream_meta(title, s) for s in result['audio']],
+        }, expire=_META_CACHE_EXPIRE)
+    except Exception as e:
+        logger.debug(f'Failed to cache metadata for {norm_url}: {e}')
+
+
+def _cached_video_streams(norm_url: str) -> Optional[Dict[str, Any]]:
+    """Materialize a cached metadata entry as CachedStream handles."""
+    if _meta_cache is None:
+        return None
     try:
-        parsed = urlparse(url)
-        # handle youtu.be short links
-        if parsed.netloc.endswith('youtu.be'):
-            vid = parsed.path.lstrip('/')
-            # remove any query/fragment
-            if vid:
-                return f'https://www.youtube.com/watch?v={vid}'
-
-        # for youtube.com links, prefer the v= query param when present
-        if parsed.netloc.endswith('youtube.com') or 'youtube' in parsed.netloc:
-            qs = parse_qs(parsed.query)
-            v = qs.get('v')
-            if v:
-                return f'https://www.youtube.com/watch?v={v[0]}'
-            # handle /shorts/<id>
-            parts = parsed.path.split('/')
-            if 'shorts' in parts:
-                idx = parts.index('shorts')
-                if idx + 1 < len(parts):
-                    return f'https://www.youtube.com/watch?v={parts[idx+1]}'
+        data = _meta_cache.get(norm_url)
     except Exception:
-        # if anything goes wrong, just return original URL
-        return url
-    return url
+        return None
+    if not data:
+        return None
+    progressive = [CachedStream(**m) for m in data['progressive']]
+    adaptive_video = [CachedStream(**m) for m in data['adaptive_video']]
+    return {
+        'backend': 'pytube-cached',
+        'title': data['title'],
+        'progressive': progressive,
+        'adaptive_video': adaptive_video,
+        'audio': [CachedStream(**m) for m in data['audio']],
+        'best_progressive': progressive[0] if progressive else None,
+        'best_adaptive': adaptive_video[0] if adaptive_video else None,
+    }
 
 
 def _get_video_streams_with_ytdlp(url: str, original_error: Exception) -> Dict[str, Any]:
@@ -87,16 +548,15 @@ def _get_video_streams_with_ytdlp(url: str, original_error: Exception) -> Dict[s
     Raises:
         RuntimeError: If yt-dlp is not available or also fails
     """
-    if not YTDLP_AVAILABLE:
+    yt_dlp = _get_ytdlp()
+    if yt_dlp is None:
         raise RuntimeError(
             f'pytube failed to fetch metadata for {url}: {original_error}.\n'
             'Consider installing yt-dlp (`pip install yt-dlp`) to enable a fallback or check the URL/connection.'
         ) from original_error
-    
+
     try:
-        ydl_opts = {'quiet': True}
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
+        info = _get_ydl({'quiet': True}).extract_info(url, download=False)
         return {
             'backend': 'yt-dlp',
             'title': info.get('title'),
@@ -107,54 +567,100 @@ def _get_video_streams_with_ytdlp(url: str, original_error: Exception) -> Dict[s
         raise RuntimeError(f'Failed to fetch metadata via yt-dlp for {url}') from ytdlp_error
 
 
-def get_video_streams(url: str) -> Dict[str, Any]:
+def get_video_streams(url: str, refresh: bool = False) -> Dict[str, Any]:
     """Return available streams for a YouTube URL.
 
     Args:
         url: YouTube video URL
+        refresh: Skip the metadata cache and force a fresh fetch
 
     Returns:
         Dictionary with 'title', 'progressive', 'adaptive_video', 'audio' lists,
-        and 'backend' indicating which library was used.
+        'best_progressive'/'best_adaptive' conveniences (highest resolution or
+        None), and 'backend' indicating which library was used.
 
     Raises:
         RuntimeError: If metadata cannot be fetched by either pytube or yt-dlp
     """
+    norm_url = _normalize_video_url(url)
+    if not refresh:
+        cached = _memcache_get(norm_url)
+        if cached is not None:
+            return cached
+        cached = _cached_video_streams(norm_url)
+        if cached is not None:
+            _memcache_put(norm_url, cached)
+            return cached
     # Try pytube first. If it fails (e.g. HTTP 400 from innertube), and yt-dlp is
     # available, fall back to yt-dlp metadata extraction so the UI can continue.
     try:
-        norm_url = _normalize_video_url(url)
-        if norm_url != url:
+        if norm_url != url and logger.isEnabledFor(logging.INFO):
             logger.info('Normalized URL: %s -> %s', url, norm_url)
+        YouTube, _, on_progress = _init_pytube()
         yt = YouTube(norm_url, on_progress_callback=on_progress)
         progressive = sorted(
-            [s for s in yt.streams.filter(progressive=True, file_extension='mp4')],
-            key=lambda s: int(s.resolution.replace('p', '')) if s.resolution else 0,
-            reverse=True
+            yt.streams.filter(progressive=True, file_extension='mp4'),
+            key=_res_key, reverse=True
         )
         adaptive_video = sorted(
-            [s for s in yt.streams.filter(only_video=True, file_extension='mp4')],
-            key=lambda s: int(s.resolution.replace('p', '')) if s.resolution else 0,
-            reverse=True
+            yt.streams.filter(only_video=True, file_extension='mp4'),
+            key=_res_key, reverse=True
         )
         audio_streams = sorted(
-            [s for s in yt.streams.filter(only_audio=True)],
-            key=lambda s: int(s.abr.replace('kbps', '')) if s.abr else 0,
-            reverse=True
+            yt.streams.filter(only_audio=True),
+            key=_abr_key, reverse=True
         )
-        return {
+        result = {
             'backend': 'pytube',
             'title': yt.title,
             'progressive': progressive,
             'adaptive_video': adaptive_video,
             'audio': audio_streams,
+            # lists are sorted best-first; precompute so per-item download
+            # paths skip the if/elif indexing ladder
+            'best_progressive': progressive[0] if progressive else None,
+            'best_adaptive': adaptive_video[0] if adaptive_video else None,
         }
+        _memcache_put(norm_url, result)
+        _cache_video_streams(norm_url, result)
+        return result
     except Exception as e:
         logger.exception('pytube failed to fetch metadata for url=%s', url)
         return _get_video_streams_with_ytdlp(url, e)
 
 
-def download_video(stream, output_path: str, filename: Optional[str] = None, 
+def get_video_streams_batch(video_urls: List[str],
+                            concurrency: int = DEFAULT_CONCURRENCY) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Hydrate metadata for many URLs concurrently.
+
+    Fans get_video_streams out over a thread pool so playlist startup pays
+    one round of parallel fetches instead of N sequential ones; results
+    land in the metadata caches, making the per-item lookups that follow
+    cache hits.
+
+    Args:
+        video_urls: Video URLs to hydrate
+        concurrency: Maximum parallel fetches
+
+    Returns:
+        Mapping of url -> streams dict (None for URLs that failed)
+    """
+    results: Dict[str, Optional[Dict[str, Any]]] = {}
+    if not video_urls:
+        return results
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        futures = {ex.submit(get_video_streams, u): u for u in video_urls}
+        for fut in as_completed(futures):
+            u = futures[fut]
+            try:
+                results[u] = fut.result()
+            except Exception as e:
+                logger.warning(f'Metadata hydration failed for {u}: {e}')
+                results[u] = None
+    return results
+
+
+def download_video(stream, output_path: str, filename: Optional[str] = None,
                    progress_callback: Optional[Callable[[int, int], None]] = None) -> str:
     """Download a pytube Stream object to output_path.
     
@@ -176,22 +682,21 @@ def download_video(stream, output_path: str, filename: Optional[str] = None,
 def _download_with_progress(stream, output_path: str, filename: Optional[str], 
                             progress_callback: Callable[[int, int], None]) -> str:
     """Helper function to download with progress tracking.
-    
+
+    The stream already carries its owning Monostate, which is where pytube
+    looks up the on_progress hook during the transfer — attach the callback
+    there directly instead of re-fetching metadata via a second YouTube
+    construction just to register it.
+
     Args:
         stream: pytube Stream object
         output_path: Directory to save the file
         filename: Optional custom filename
         progress_callback: Callback(bytes_received, total_bytes)
-        
+
     Returns:
         Path to the downloaded file
     """
-    yt = YouTube(stream.player_config_args.get('url')) if hasattr(stream, 'player_config_args') else None
-    
-    if yt is None:
-        # Fallback to direct download without progress
-        return stream.download(output_path=output_path, filename=filename) if filename else stream.download(output_path=output_path)
-
     def _on_progress(s, chunk, bytes_remaining):
         total = s.filesize
         received = total - bytes_remaining
@@ -200,17 +705,135 @@ def _download_with_progress(stream, output_path: str, filename: Optional[str],
         except Exception as e:
             logger.warning(f'Progress callback error: {e}')
 
-    yt.register_on_progress_callback(_on_progress)
-    
-    # Find matching stream on this yt instance
-    candidate = next((s for s in yt.streams if s.itag == stream.itag), stream)
-    
-    return candidate.download(output_path=output_path, filename=filename) if filename else candidate.download(output_path=output_path)
+    monostate = getattr(stream, '_monostate', None)
+    if monostate is not None:
+        monostate.on_progress = _on_progress
+        return stream.download(output_path=output_path, filename=filename) if filename else stream.download(output_path=output_path)
 
+    # Cache-backed stream handles carry no monostate; stream the bytes over
+    # the pooled session ourselves so progress still fires.
+    url = getattr(stream, 'url', None)
+    if url:
+        name = filename or getattr(stream, 'default_filename', None) or 'download.mp4'
+        os.makedirs(output_path, exist_ok=True)
+        out = os.path.join(output_path, name)
+        received = 0
+        with HTTP_SESSION.get(url, stream=True, timeout=60) as resp:
+            resp.raise_for_status()
+            total = getattr(stream, 'filesize', None) or int(resp.headers.get('Content-Length') or 0)
+            with open(out, 'wb') as f:
+                for chunk in resp.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+                    received += len(chunk)
+                    try:
+                        progress_callback(received, total)
+                    except Exception as e:
+                        logger.warning(f'Progress callback error: {e}')
+        return out
 
-def download_audio(stream, output_path: str, filename: Optional[str] = None, 
-                   convert_mp3: bool = False, 
-                   progress_callback: Optional[Callable[[int, int], None]] = None) -> str:
+    return stream.download(output_path=output_path, filename=filename) if filename else stream.download(output_path=output_path)
+
+
+def download_video_parallel(stream, output_path: str, filename: Optional[str] = None,
+                            parts: int = 4,
+                            progress_callback: Optional[Callable[[int, int], None]] = None,
+                            session: Optional[requests.Session] = None) -> str:
+    """Download a pytube Stream with several parallel HTTP range requests.
+
+    A single TCP flow often cannot saturate a fast link; splitting the file
+    into `parts` range GETs over the pooled session recovers that bandwidth.
+    Falls back to the regular single-stream download when the CDN does not
+    honor range requests or anything goes wrong mid-transfer.
+
+    Args:
+        stream: pytube Stream object
+        output_path: Directory to save the file
+        filename: Optional custom filename
+        parts: Number of parallel range requests
+        progress_callback: Optional callback(bytes_received, total_bytes)
+        session: HTTP session to use (defaults to the shared pooled one)
+
+    Returns:
+        Path to the downloaded file
+    """
+    session = session or HTTP_SESSION
+    url = stream.url
+    try:
+        head = session.head(url, allow_redirects=True, timeout=30)
+        total = int(head.headers.get('Content-Length') or 0)
+        accepts_ranges = head.headers.get('Accept-Ranges', '').lower() == 'bytes'
+    except Exception:
+        total, accepts_ranges = 0, False
+
+    if total <= 0 or not accepts_ranges or parts <= 1:
+        return download_video(stream, output_path, filename, progress_callback)
+
+    name = filename or getattr(stream, 'default_filename', None) or 'download.mp4'
+    os.makedirs(output_path, exist_ok=True)
+    out_path = os.path.join(output_path, name)
+
+    received = {'v': 0}
+    lock = threading.Lock()
+    has_pwrite = hasattr(os, 'pwrite')
+
+    def _report(n: int) -> None:
+        if progress_callback:
+            with lock:
+                received['v'] += n
+                done = received['v']
+            try:
+                progress_callback(done, total)
+            except Exception as e:
+                logger.warning(f'Progress callback error: {e}')
+
+    def _fetch_range(fd: int, start: int, end: int) -> None:
+        resp = session.get(url, headers={'Range': f'bytes={start}-{end}'},
+                           stream=True, timeout=60)
+        if resp.status_code != 206:
+            raise RuntimeError(f'Range request not honored (HTTP {resp.status_code})')
+        if has_pwrite:
+            # positioned writes on the shared descriptor: no per-worker
+            # open and no seek contention
+            offset = start
+            for chunk in resp.iter_content(chunk_size=256 * 1024):
+                if not chunk:
+                    continue
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                _report(len(chunk))
+        else:
+            # Windows: each worker keeps its own handle at its own offset
+            with open(out_path, 'r+b') as f:
+                f.seek(start)
+                for chunk in resp.iter_content(chunk_size=256 * 1024):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    _report(len(chunk))
+
+    try:
+        # preallocate so workers can write their segments in place
+        with open(out_path, 'wb') as f:
+            f.truncate(total)
+            ranges = [(i * total // parts, (i + 1) * total // parts - 1) for i in range(parts)]
+            with ThreadPoolExecutor(max_workers=parts) as ex:
+                for fut in as_completed([ex.submit(_fetch_range, f.fileno(), a, b)
+                                         for a, b in ranges]):
+                    fut.result()
+        return out_path
+    except Exception as e:
+        logger.warning('Parallel range download failed (%s); falling back to single stream', e)
+        try:
+            os.remove(out_path)
+        except OSError:
+            pass
+        return download_video(stream, output_path, filename, progress_callback)
+
+
+def download_audio(stream, output_path: str, filename: Optional[str] = None,
+                   convert_mp3: bool = False,
+                   progress_callback: Optional[Callable[[int, int], None]] = None,
+                   defer_convert: bool = False) -> str:
     """Download audio-only stream. If convert_mp3 and pydub+ffmpeg available, convert to mp3.
 
     Args:
@@ -219,7 +842,10 @@ def download_audio(stream, output_path: str, filename: Optional[str] = None,
         filename: Optional custom filename
         convert_mp3: Whether to convert to MP3 format
         progress_callback: Optional callback(bytes_received, total_bytes)
-        
+        defer_convert: Return the raw audio path and let the caller schedule
+            the MP3 conversion elsewhere (e.g. a process pool), so the
+            download thread is free to start the next file
+
     Returns:
         Path to the downloaded file
     """
@@ -228,25 +854,52 @@ def download_audio(stream, output_path: str, filename: Optional[str] = None,
     else:
         base_out = stream.download(output_path=output_path, filename=filename) if filename else stream.download(output_path=output_path)
 
+    if defer_convert:
+        return base_out
     return _convert_to_mp3_if_needed(base_out, convert_mp3)
 
 
 def _convert_to_mp3_if_needed(audio_file: str, convert_mp3: bool) -> str:
     """Convert audio file to MP3 if requested and tools are available.
-    
+
+    Encodes with ffmpeg directly (multi-threaded lame, file-to-file) so the
+    audio never round-trips through Python as a decoded PCM buffer the way
+    pydub's AudioSegment does; pydub remains as a fallback if the
+    subprocess fails.
+
     Args:
         audio_file: Path to the audio file
         convert_mp3: Whether to convert to MP3
-        
+
     Returns:
         Path to the final audio file (MP3 or original)
     """
-    if not convert_mp3 or not PYDUB_AVAILABLE or not is_ffmpeg_available():
+    if not convert_mp3 or not is_ffmpeg_available():
+        return audio_file
+
+    name, _ext = os.path.splitext(audio_file)
+    mp3_path = name + '.mp3'
+    try:
+        subprocess.run(
+            [_ffmpeg_path(), '-y', '-loglevel', 'error', '-i', audio_file, '-vn',
+             '-c:a', 'libmp3lame', '-q:a', '2',
+             '-threads', str(os.cpu_count() or 1), mp3_path],
+            check=True, capture_output=True)
+        return mp3_path
+    except Exception as e:
+        logger.debug(f'ffmpeg MP3 encode failed, trying pydub: {e}')
+
+    AudioSegment = _get_audiosegment()
+    if AudioSegment is None:
         return audio_file
-    
     try:
-        name, _ext = os.path.splitext(audio_file)
-        mp3_path = name + '.mp3'
+        # pydub decodes the entire file into RAM (roughly 10x the
+        # compressed size as PCM); don't let a long recording OOM the
+        # process just to salvage a failed ffmpeg run
+        if os.path.getsize(audio_file) > 512 * 1024 * 1024:
+            logger.warning('Skipping pydub fallback for %s: file too large '
+                           'for in-memory conversion', audio_file)
+            return audio_file
         audio = AudioSegment.from_file(audio_file)
         audio.export(mp3_path, format='mp3')
         return mp3_path
@@ -255,14 +908,35 @@ def _convert_to_mp3_if_needed(audio_file: str, convert_mp3: bool) -> str:
         return audio_file
 
 
+def convert_to_mp3(audio_file: str) -> str:
+    """Convert an already-downloaded audio file to MP3.
+
+    Top-level wrapper around the same conversion used inline, so it can be
+    submitted to a ProcessPoolExecutor (picklable by reference).
+
+    Args:
+        audio_file: Path to the audio file
+
+    Returns:
+        Path to the MP3 (or the original file if conversion is unavailable)
+    """
+    return _convert_to_mp3_if_needed(audio_file, True)
+
+
+@functools.lru_cache(maxsize=1)
 def has_yt_dlp() -> bool:
-    return YTDLP_AVAILABLE
+    # find_spec only consults the import machinery; availability checks
+    # (UI gating, fallback decisions) don't pay the full yt_dlp import
+    return importlib.util.find_spec('yt_dlp') is not None
 
 
-def download_with_ytdlp(url: str, output_path: str, audio_only: bool = False, 
+def download_with_ytdlp(url: str, output_path: str, audio_only: bool = False,
                         convert_mp3: bool = False,
                         progress_callback: Optional[Callable[[str, int, int, float, float], None]] = None,
-                        progress_file: Optional[str] = None) -> str:
+                        progress_file: Optional[str] = None,
+                        prefetched_info: Optional[Dict[str, Any]] = None,
+                        http_session: Optional[requests.Session] = None,
+                        format_selector: Optional[str] = None) -> str:
     """Download using yt-dlp programmatic API.
 
     Args:
@@ -272,34 +946,111 @@ def download_with_ytdlp(url: str, output_path: str, audio_only: bool = False,
         convert_mp3: Whether to convert to MP3 (for audio)
         progress_callback: Optional callback(filename, received_bytes, total_bytes, speed, eta)
         progress_file: Optional path to write progress updates
-        
+        prefetched_info: Optional info dict from a previous extract_info call;
+            skips the per-video metadata round-trip
+        http_session: Optional pre-configured requests.Session. yt-dlp owns
+            its transport (it pools per YoutubeDL instance, and routes via
+            requests itself when installed), so an external session cannot
+            be injected wholesale; its headers and proxy settings are
+            honored here, which is the supported hook point.
+        format_selector: Optional yt-dlp format string (ignored when
+            audio_only is set, which forces bestaudio)
+
     Returns:
         Path to the downloaded file
-        
+
     Raises:
         RuntimeError: If yt-dlp is not available
     """
-    if not YTDLP_AVAILABLE:
+    yt_dlp = _get_ytdlp()
+    if yt_dlp is None:
         raise RuntimeError('yt-dlp is not available')
 
     ydl_opts = {
         'outtmpl': os.path.join(output_path, '%(title)s.%(ext)s'),
         'quiet': True,
+        # reuse CDN connections across fragments instead of reconnecting
+        'http_headers': {'Connection': 'keep-alive'},
+        # large chunks + parallel DASH fragments + 1 MB write buffer: fewer
+        # HTTP round-trips and far fewer write syscalls per MB
+        'http_chunk_size': 10 * 1024 * 1024,
+        'concurrent_fragment_downloads': 4,
+        'buffersize': 1024 * 1024,
     }
     if audio_only:
         ydl_opts.update({'format': 'bestaudio/best', 'postprocessors': []})
-    
+    elif format_selector:
+        ydl_opts['format'] = format_selector
+    if http_session is not None:
+        # carry over only headers the caller explicitly set: a Session
+        # ships defaults (python-requests User-Agent, Accept*) that would
+        # clobber yt-dlp's browser-like header set and invite degraded
+        # responses; connection pooling stays with yt-dlp's own transport
+        session_defaults = requests.utils.default_headers()
+        ydl_opts['http_headers'].update({
+            k: v for k, v in http_session.headers.items()
+            if session_defaults.get(k) != v
+        })
+        if http_session.proxies:
+            ydl_opts['proxy'] = (http_session.proxies.get('https')
+                                 or http_session.proxies.get('http'))
+
     ydl_opts['progress_hooks'] = [_create_ytdlp_progress_hook(progress_callback, progress_file)]
 
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=True)
+        if prefetched_info is not None:
+            info = ydl.process_ie_result(dict(prefetched_info), download=True)
+        else:
+            info = ydl.extract_info(url, download=True)
         fname = _get_downloaded_filename(ydl, info)
-    
+
+    if audio_only and convert_mp3:
+        # the audio branch disables yt-dlp postprocessors, so MP3
+        # conversion runs through the same ffmpeg path as download_audio
+        fname = _convert_to_mp3_if_needed(fname, True)
+
     _write_completion_status(progress_file, fname)
     return fname
 
 
-def _create_ytdlp_progress_hook(progress_callback: Optional[Callable], 
+class SpeedTracker:
+    """Exponentially-weighted moving average of a transfer's speed.
+
+    A cumulative received/elapsed average is dominated by the first few
+    seconds of the download; the EWMA tracks the current rate instead,
+    so speed and ETA react when the connection is throttled mid-transfer.
+    """
+
+    __slots__ = ('_last_ns', '_last_bytes', 'speed')
+
+    _ALPHA = 0.3
+
+    def __init__(self):
+        self._last_ns = time.monotonic_ns()
+        self._last_bytes = 0
+        self.speed = 0.0
+
+    def update(self, received: int) -> float:
+        now = time.monotonic_ns()
+        dt_s = (now - self._last_ns) / 1e9
+        if dt_s <= 0:
+            return self.speed
+        instant = max(received - self._last_bytes, 0) / dt_s
+        self._last_ns = now
+        self._last_bytes = received
+        if self.speed == 0.0:
+            self.speed = instant
+        else:
+            self.speed = self._ALPHA * instant + (1.0 - self._ALPHA) * self.speed
+        return self.speed
+
+    def eta(self, received: int, total: int) -> int:
+        if self.speed <= 0 or total <= received:
+            return 0
+        return int((total - received) / self.speed)
+
+
+def _create_ytdlp_progress_hook(progress_callback: Optional[Callable],
                                 progress_file: Optional[str]) -> Callable:
     """Create a progress hook for yt-dlp downloads.
     
@@ -310,14 +1061,19 @@ def _create_ytdlp_progress_hook(progress_callback: Optional[Callable],
     Returns:
         Progress hook function
     """
+    tracker = SpeedTracker()
+
     def _hook(d: Dict[str, Any]):
         if d.get('status') != 'downloading':
             return
-            
+
         downloaded = d.get('downloaded_bytes', 0)
         total = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
-        speed = d.get('speed', 0.0)
-        eta = d.get('eta', 0)
+        # yt-dlp reports speed=None early in a transfer; keep our own
+        # EWMA so the UI never shows a blank rate
+        ewma = tracker.update(int(downloaded or 0))
+        speed = d.get('speed') or ewma
+        eta = d.get('eta') or tracker.eta(int(downloaded or 0), int(total or 0))
         filename = d.get('filename', '')
         
         if progress_callback:
@@ -327,18 +1083,14 @@ def _create_ytdlp_progress_hook(progress_callback: Optional[Callable],
                 logger.warning(f'Progress callback error: {e}')
         
         if progress_file:
-            try:
-                from progress_store import write_progress_file
-                write_progress_file(progress_file, {
-                    'status': 'downloading',
-                    'filename': filename,
-                    'downloaded': int(downloaded),
-                    'total': int(total),
-                    'speed': float(speed),
-                    'eta': int(eta),
-                })
-            except Exception as e:
-                logger.warning(f'Failed to write progress file: {e}')
+            _progress_writer.write(progress_file, {
+                'status': 'downloading',
+                'filename': filename,
+                'downloaded': int(downloaded),
+                'total': int(total),
+                'speed': float(speed),
+                'eta': int(eta),
+            })
     
     return _hook
 
@@ -367,10 +1119,9 @@ def _write_completion_status(progress_file: Optional[str], filename: str):
     """
     if not progress_file:
         return
-        
+
     try:
-        from progress_store import write_progress_file
-        write_progress_file(progress_file, {
+        _progress_writer.write(progress_file, {
             'status': 'completed',
             'filename': filename,
         })
@@ -398,45 +1149,360 @@ def download_fallback(url: str, output_path: str, audio_only: bool = False,
     Raises:
         Exception: If both pytube and yt-dlp fail
     """
-    # Try pytube approach (single video)
-    try:
-        yt = YouTube(url)
-        # pick best progressive
-        streams = yt.streams.filter(progressive=True, file_extension='mp4')
-        stream = None
-        if streams:
-            stream = sorted(streams, key=lambda s: int(s.resolution.replace('p','')) if s.resolution else 0, reverse=True)[0]
-        else:
-            # pick best adaptive video
-            av = yt.streams.filter(only_video=True, file_extension='mp4')
-            if av:
-                stream = sorted(av, key=lambda s: int(s.resolution.replace('p','')) if s.resolution else 0, reverse=True)[0]
-
-        if stream is None:
-            raise RuntimeError('No suitable stream found for pytube')
-
-        start = time.time()
-        def _local_progress(received, total):
-            now = time.time()
-            elapsed = max(now - start, 1e-6)
-            speed = received / elapsed
-            eta = (total - received) / speed if speed > 0 else 0
-            if progress_callback:
+    # Backend hint: once pytube has failed for a URL, later runs go
+    # straight to yt-dlp instead of re-paying the sequential failure.
+    hint_key = 'backend-hint:' + _normalize_video_url(url)
+    hint = None
+    if _meta_cache is not None:
+        try:
+            hint = _meta_cache.get(hint_key)
+        except Exception:
+            hint = None
+
+    # Try pytube approach (single video), unless it is known to fail here
+    if hint != 'yt-dlp' or not has_yt_dlp():
+        try:
+            YouTube = _init_pytube()[0]
+            yt = YouTube(url)
+            # pick best progressive; max() is a single O(n) pass vs sorting
+            # the whole listing just to take its head
+            streams = yt.streams.filter(progressive=True, file_extension='mp4')
+            stream = None
+            if streams:
+                stream = max(streams, key=_res_key)
+            else:
+                # pick best adaptive video
+                av = yt.streams.filter(only_video=True, file_extension='mp4')
+                if av:
+                    stream = max(av, key=_res_key)
+
+            if stream is None:
+                raise RuntimeError('No suitable stream found for pytube')
+
+            start = time.time()
+            # resolve once: default_filename renders a template per access
+            # and the callback runs on every chunk
+            stream_name = getattr(stream, 'default_filename', '')
+
+            def _local_progress(received, total):
+                now = time.time()
+                elapsed = max(now - start, 1e-6)
+                speed = received / elapsed
+                eta = (total - received) / speed if speed > 0 else 0
+                if progress_callback:
+                    try:
+                        progress_callback(stream_name, received, total, speed, int(eta))
+                    except Exception:
+                        pass
+
+            return download_video(stream, output_path, progress_callback=_local_progress)
+        except Exception:
+            # remember the failure so the next attempt skips pytube
+            if _meta_cache is not None:
                 try:
-                    progress_callback(stream.default_filename if hasattr(stream, 'default_filename') else '', received, total, speed, int(eta))
+                    _meta_cache.set(hint_key, 'yt-dlp', expire=3600)
                 except Exception:
                     pass
+            if not has_yt_dlp():
+                raise
+
+    return download_with_ytdlp(url, output_path, audio_only=audio_only, convert_mp3=convert_mp3, progress_callback=progress_callback, progress_file=progress_file)
+
+
+# Innertube player endpoint used for the async metadata prefetch. The ANDROID
+# client returns direct stream URLs, so no base.js cipher work is needed.
+_INNERTUBE_PLAYER_URL = 'https://www.youtube.com/youtubei/v1/player'
+_INNERTUBE_CONTEXT = {
+    'client': {'clientName': 'ANDROID', 'clientVersion': '19.09.37', 'androidSdkVersion': 30}
+}
+
+
+def _innertube_format_meta(title: str, fmt: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an innertube format dict to the cached-stream metadata shape."""
+    bitrate = fmt.get('bitrate') or 0
+    return {
+        'title': title,
+        'itag': fmt.get('itag'),
+        'resolution': fmt.get('qualityLabel'),
+        'abr': f'{bitrate // 1000}kbps' if bitrate else None,
+        'mime_type': (fmt.get('mimeType') or '').split(';')[0] or None,
+        'url': fmt.get('url'),
+        'filesize': int(fmt['contentLength']) if fmt.get('contentLength') else None,
+    }
 
-        out = download_video(stream, output_path, progress_callback=_local_progress)
-        return out
+
+def _meta_res_key(m: Dict[str, Any]) -> int:
+    """_res_key over cached-metadata dicts ('1080p' -> 1080).
+
+    Tolerates innertube qualityLabel suffixes like '720p60'/'1080p60 HDR'.
+    """
+    height = (m.get('resolution') or '').split('p', 1)[0]
+    return int(height) if height.isdigit() else 0
+
+
+def _meta_abr_key(m: Dict[str, Any]) -> int:
+    """_abr_key over cached-metadata dicts ('128kbps' -> 128)."""
+    abr = m.get('abr')
+    return int(abr[:-4]) if abr else 0
+
+
+async def _prefetch_one(session, sem: 'asyncio.Semaphore', url: str) -> bool:
+    """Fetch player metadata for one video and store it in the disk cache."""
+    import asyncio
+
+    norm_url = _normalize_video_url(url)
+    qs = parse_qs(urlparse(norm_url).query)
+    video_id = (qs.get('v') or [None])[0]
+    if not video_id:
+        return False
+    payload = {'context': _INNERTUBE_CONTEXT, 'videoId': video_id}
+    async with sem:
+        for _ in range(2):
+            async with session.post(_INNERTUBE_PLAYER_URL, json=payload) as resp:
+                if resp.status == 429:
+                    # rate limited: honor Retry-After before the single retry
+                    await asyncio.sleep(float(resp.headers.get('Retry-After', 1)))
+                    continue
+                if resp.status != 200:
+                    return False
+                info = await resp.json()
+            break
+        else:
+            return False
+    streaming = info.get('streamingData') or {}
+    title = (info.get('videoDetails') or {}).get('title') or ''
+    progressive, adaptive_video, audio = [], [], []
+    for fmt in streaming.get('formats') or []:
+        if fmt.get('url'):
+            progressive.append(_innertube_format_meta(title, fmt))
+    for fmt in streaming.get('adaptiveFormats') or []:
+        if not fmt.get('url'):
+            continue
+        meta = _innertube_format_meta(title, fmt)
+        if (meta['mime_type'] or '').startswith('audio'):
+            audio.append(meta)
+        elif (meta['mime_type'] or '').startswith('video'):
+            adaptive_video.append(meta)
+    if not (progressive or adaptive_video or audio):
+        return False
+    # cache best-first: innertube lists formats ascending, but every
+    # consumer ([0] picks, best_progressive/best_adaptive) assumes the
+    # descending order get_video_streams establishes
+    progressive.sort(key=_meta_res_key, reverse=True)
+    adaptive_video.sort(key=_meta_res_key, reverse=True)
+    audio.sort(key=_meta_abr_key, reverse=True)
+    _meta_cache.set(norm_url, {
+        'title': title,
+        'progressive': progressive,
+        'adaptive_video': adaptive_video,
+        'audio': audio,
+    }, expire=_META_CACHE_EXPIRE)
+    return True
+
+
+def prefetch_playlist_metadata(video_urls: List[str],
+                               concurrency: int = DEFAULT_CONCURRENCY) -> int:
+    """Warm the metadata cache for many URLs with one async fan-out.
+
+    Per-item pytube metadata fetches block a worker thread for seconds
+    each; a single event loop with a bounded semaphore fetches the same
+    innertube JSON for the whole playlist concurrently, after which
+    get_video_streams is served from the cache.
+
+    Args:
+        video_urls: Video URLs to prefetch
+        concurrency: Maximum in-flight requests
+
+    Returns:
+        Number of URLs successfully cached (0 when aiohttp or the disk
+        cache is unavailable)
+    """
+    if not AIOHTTP_AVAILABLE or _meta_cache is None or not video_urls:
+        return 0
+    import asyncio
+
+    async def _run() -> int:
+        sem = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency * 2)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(
+                *(_prefetch_one(session, sem, u) for u in video_urls),
+                return_exceptions=True)
+        return sum(1 for r in results if r is True)
+
+    try:
+        return asyncio.run(_run())
+    except Exception as e:
+        logger.debug(f'Async metadata prefetch failed: {e}')
+        return 0
+
+
+def _extract_one(url: str) -> Dict[str, Any]:
+    """Extract full metadata for a single video.
+
+    Top-level (picklable) so it can run in worker processes: yt-dlp
+    extraction is CPU-heavy (JSON parse + signature resolution) and
+    GIL-bound in threads.
+    """
+    ydl_opts = {
+        'quiet': True,
+        'skip_download': True,
+        'youtube_include_dash_manifest': False,
+    }
+    return _get_ydl(ydl_opts).extract_info(url, download=False)
+
+
+def _extract_playlist_entries(playlist_url: str,
+                              concurrency: int = DEFAULT_CONCURRENCY) -> List[Dict[str, Any]]:
+    """Fetch metadata for every playlist entry up front.
+
+    A cheap flat extraction lists the entry URLs, then per-video
+    extraction fans out across a process pool — the parse work scales
+    with cores instead of being serialized by the GIL. Falls back to a
+    single serial batch extraction if the pool cannot run.
+
+    Args:
+        playlist_url: URL of the YouTube playlist
+        concurrency: Upper bound on metadata worker processes
+
+    Returns:
+        List of per-entry info dicts (with formats already resolved)
+
+    Raises:
+        RuntimeError: If yt-dlp is unavailable or the playlist has no entries
+    """
+    yt_dlp = _get_ytdlp()
+    if yt_dlp is None:
+        raise RuntimeError('yt-dlp is not available')
+    try:
+        urls = _extract_playlist_urls_with_ytdlp(playlist_url)
     except Exception:
-        # fallback to yt-dlp if available
-        if YTDLP_AVAILABLE:
-            return download_with_ytdlp(url, output_path, audio_only=audio_only, convert_mp3=convert_mp3, progress_callback=progress_callback, progress_file=progress_file)
-        raise
+        urls = []
+    if urls:
+        try:
+            workers = max(1, min(concurrency, os.cpu_count() or 1))
+            entries = []
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                futures = [ex.submit(_extract_one, u) for u in urls]
+                for fut in futures:
+                    try:
+                        info = fut.result()
+                    except Exception as e:
+                        logger.warning(f'Metadata extraction failed for one entry: {e}')
+                        continue
+                    if isinstance(info, dict):
+                        entries.append(info)
+            if entries:
+                return entries
+        except Exception:
+            logger.exception('Process-pool metadata extraction failed; '
+                             'using a single batch call')
+    ydl_opts = {
+        'quiet': True,
+        'extract_flat': False,
+        'skip_download': True,
+        'youtube_include_dash_manifest': False,
+    }
+    info = _get_ydl(ydl_opts).extract_info(playlist_url, download=False)
+    entries = [e for e in (info.get('entries') or []) if isinstance(e, dict)]
+    if not entries:
+        raise RuntimeError('No videos found in playlist')
+    return entries
 
 
-def download_playlist(playlist_url: str, output_path: str, 
+def _ytdlp_format_for_resolution(resolution_preference: Optional[str]) -> Optional[str]:
+    """Map a pytube-style resolution string ('720p') to a yt-dlp format selector."""
+    if not resolution_preference:
+        return None
+    try:
+        height = int(str(resolution_preference).rstrip('pP'))
+    except ValueError:
+        return None
+    return f'bestvideo[height<={height}]+bestaudio/best[height<={height}]'
+
+
+def _download_playlist_with_ytdlp(playlist_url: str, output_path: str,
+                                  audio_only: bool, convert_mp3: bool,
+                                  concurrency: int,
+                                  per_item_callback: Optional[Callable],
+                                  progress_dir: Optional[str],
+                                  max_retries: int,
+                                  backoff_factor: float,
+                                  resolution_preference: Optional[str] = None) -> List[str]:
+    """Playlist download path using one batch metadata extraction.
+
+    Workers receive prefetched info dicts, so each item goes straight to
+    the transfer instead of re-running metadata extraction.
+    """
+    entries = _extract_playlist_entries(playlist_url, concurrency)
+    fmt = _ytdlp_format_for_resolution(resolution_preference)
+
+    def _download_entry(entry: Dict[str, Any], index: int):
+        title = entry.get('title') or entry.get('id') or ''
+        video_url = entry.get('webpage_url') or entry.get('url') or playlist_url
+        attempts = 0
+        while True:
+            try:
+                def ytdlp_cb(fn, downloaded, total, speed, eta):
+                    if per_item_callback:
+                        try:
+                            per_item_callback(title, 'downloading', video_url, index,
+                                              int(downloaded or 0), int(total or 0),
+                                              float(speed or 0.0), int(eta or 0))
+                        except Exception:
+                            pass
+
+                pf = None
+                if progress_dir:
+                    pf = progress_file_for_id(output_path, f'playlist_{index}')
+                out = download_with_ytdlp(video_url, output_path, audio_only=audio_only,
+                                          convert_mp3=convert_mp3, progress_callback=ytdlp_cb,
+                                          progress_file=pf, prefetched_info=entry,
+                                          format_selector=fmt)
+                if per_item_callback:
+                    try:
+                        per_item_callback(title, 'completed', video_url, index, 0, 0, 0.0, 0.0)
+                    except Exception:
+                        pass
+                return out, title, 'ok'
+            except Exception as e:
+                attempts += 1
+                if attempts > max_retries:
+                    # terminal dispatch: without it the caller's table row
+                    # stays at 'downloading' forever
+                    if per_item_callback:
+                        try:
+                            per_item_callback(title or video_url, f'error:{e}', video_url, index, 0, 0, 0.0, 0)
+                        except Exception:
+                            pass
+                    return None, title or video_url, f'error:{e}'
+                # interruptible backoff: wait() returns True on shutdown
+                if _shutdown_event.wait(backoff_factor * (2 ** (attempts - 1))):
+                    if per_item_callback:
+                        try:
+                            per_item_callback(title or video_url, 'cancelled', video_url, index, 0, 0, 0.0, 0)
+                        except Exception:
+                            pass
+                    return None, title or video_url, 'cancelled'
+
+    downloaded = []
+    sem = threading.Semaphore(max(1, concurrency * 2))
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        futures = {}
+        for i, entry in enumerate(entries):
+            # bounded submission: never queue more than 2x the workers
+            sem.acquire()
+            fut = ex.submit(_download_entry, entry, i)
+            fut.add_done_callback(lambda _f: sem.release())
+            futures[fut] = i
+        for fut in as_completed(futures):
+            out, title, status = fut.result()
+            if status == 'ok' and out:
+                downloaded.append(out)
+    return downloaded
+
+
+def download_playlist(playlist_url: str, output_path: str,
                       resolution_preference: Optional[str] = None,
                       audio_only: bool = False, convert_mp3: bool = False, 
                       concurrency: int = DEFAULT_CONCURRENCY,
@@ -464,35 +1530,104 @@ def download_playlist(playlist_url: str, output_path: str,
     Raises:
         RuntimeError: If playlist cannot be parsed or no videos found
     """
-    downloaded = []
-
+    # Preferred path: one batch metadata extraction for the whole playlist
+    # instead of a fresh innertube session per item.
+    if has_yt_dlp():
+        try:
+            return _download_playlist_with_ytdlp(
+                playlist_url, output_path, audio_only, convert_mp3, concurrency,
+                per_item_callback, progress_dir, max_retries, backoff_factor,
+                resolution_preference=resolution_preference)
+        except Exception:
+            logger.exception('yt-dlp batch playlist extraction failed; '
+                             'falling back to per-item pytube path')
+
+    return [out for out, _title, status in iter_download_playlist(
+        playlist_url, output_path,
+        resolution_preference=resolution_preference, audio_only=audio_only,
+        convert_mp3=convert_mp3, concurrency=concurrency,
+        per_item_callback=per_item_callback, progress_dir=progress_dir,
+        max_retries=max_retries, backoff_factor=backoff_factor)
+        if status == 'ok' and out]
+
+
+def iter_download_playlist(playlist_url: str, output_path: str,
+                           resolution_preference: Optional[str] = None,
+                           audio_only: bool = False, convert_mp3: bool = False,
+                           concurrency: int = DEFAULT_CONCURRENCY,
+                           per_item_callback: Optional[Callable[[str, str, str, int, int, int, float, int], None]] = None,
+                           progress_dir: Optional[str] = None,
+                           max_retries: int = DEFAULT_MAX_RETRIES,
+                           backoff_factor: float = DEFAULT_BACKOFF_FACTOR):
+    """Download playlist items on the pytube path, yielding them as they finish.
+
+    Generator counterpart to `download_playlist`: callers see each item the
+    moment it completes instead of waiting for the whole run. Submission is
+    bounded by a semaphore at twice the worker count, so huge playlists do
+    not materialize every future (and its pending connections) up front.
+
+    Args match `download_playlist`.
+
+    Yields:
+        (path, title, status) tuples; path is None for failed items.
+    """
     video_urls = _extract_playlist_urls(playlist_url)
 
+    # Warm the metadata cache in one async fan-out so the per-item
+    # get_video_streams calls below become cache hits; if the async
+    # prefetch cannot run (no aiohttp/disk cache), hydrate over threads.
+    if not prefetch_playlist_metadata(list(video_urls), concurrency):
+        get_video_streams_batch(list(video_urls), concurrency)
+
     def _download_one(video_url, index=None):
+        # Resolve metadata once, outside the retry loop: a transfer that
+        # fails late should not pay a fresh metadata fetch per attempt.
+        try:
+            streams = get_video_streams(video_url)
+        except Exception as e:
+            return None, video_url, f'error:{e}'
+        title = streams['title']
+        # one progress path per item; the callbacks below fire per chunk
+        # and should not rebuild it every tick
+        pf = None
+        if progress_dir:
+            try:
+                pf = progress_file_for_id(output_path, f'playlist_{index}')
+            except Exception:
+                pass
+        # intermediate ticks arrive per chunk; the UI only samples a few
+        # times a second, so coalesce dispatches to ~10 Hz per item
+        last_cb = {'t': 0.0}
+
+        def _should_dispatch(now: float) -> bool:
+            if now - last_cb['t'] < 0.1:
+                return False
+            last_cb['t'] = now
+            return True
+
         attempts = 0
         while attempts <= max_retries:
             try:
-                streams = get_video_streams(video_url)
-                title = streams['title']
                 if audio_only:
                     if not streams['audio']:
                         return None, title, 'no-audio'
                     stream = streams['audio'][0]
 
+                    audio_tracker = SpeedTracker()
+
                     def audio_cb(received, total):
+                        speed = audio_tracker.update(received)
+                        if not _should_dispatch(time.monotonic()):
+                            return
+                        eta = audio_tracker.eta(received, total)
                         if per_item_callback:
                             try:
-                                per_item_callback(title, 'downloading', video_url, index, int(received), int(total), 0.0, 0.0)
+                                per_item_callback(title, 'downloading', video_url, index, int(received), int(total), float(speed), int(eta))
                             except Exception:
                                 pass
                         # write to per-item progress file if requested
-                        if progress_dir:
-                            try:
-                                from progress_store import write_progress_file, progress_file_for_id
-                                pf = progress_file_for_id(output_path, f'playlist_{index}')
-                                write_progress_file(pf, {'title': title, 'status': 'downloading', 'downloaded': int(received), 'total': int(total)})
-                            except Exception:
-                                pass
+                        if pf:
+                            _progress_writer.write(pf, {'title': title, 'status': 'downloading', 'downloaded': int(received), 'total': int(total), 'speed': float(speed), 'eta': int(eta)})
 
                     out = download_audio(stream, output_path, filename=_safe_filename(title), convert_mp3=convert_mp3, progress_callback=audio_cb)
                     if per_item_callback:
@@ -502,61 +1637,54 @@ def download_playlist(playlist_url: str, output_path: str,
                             pass
                     return out, title, 'ok'
                 else:
-                    # pick stream
+                    # pick stream; chain() walks both listings without
+                    # allocating a concatenated copy per item
                     stream = None
                     if resolution_preference:
-                        for s in streams['progressive'] + streams['adaptive_video']:
-                            if s.resolution == resolution_preference:
-                                stream = s
-                                break
-                    if not stream:
-                        if streams['progressive']:
-                            stream = streams['progressive'][0]
-                        elif streams['adaptive_video']:
-                            stream = streams['adaptive_video'][0]
+                        stream = next(
+                            (s for s in chain(streams['progressive'], streams['adaptive_video'])
+                             if s.resolution == resolution_preference),
+                            None)
+                    if stream is None:
+                        stream = streams.get('best_progressive') or streams.get('best_adaptive')
                     if stream is None:
                         return None, title, 'no-stream'
 
-                    start_time = time.time()
+                    video_tracker = SpeedTracker()
                     last_received = {'v': 0}
 
                     def video_cb(received, total):
-                        now = time.time()
-                        elapsed = max(now - start_time, 1e-6)
-                        speed = (received) / elapsed
-                        eta = int((total - received) / speed) if speed > 0 else 0
                         last_received['v'] = received
+                        speed = video_tracker.update(received)
+                        if not _should_dispatch(time.monotonic()):
+                            return
+                        eta = video_tracker.eta(received, total)
                         if per_item_callback:
                             try:
                                 per_item_callback(title, 'downloading', video_url, index, int(received), int(total), float(speed), int(eta))
                             except Exception:
                                 pass
-                        if progress_dir:
-                            try:
-                                from progress_store import write_progress_file, progress_file_for_id
-                                pf = progress_file_for_id(output_path, f'playlist_{index}')
-                                write_progress_file(pf, {'title': title, 'status': 'downloading', 'downloaded': int(received), 'total': int(total), 'speed': float(speed), 'eta': int(eta)})
-                            except Exception:
-                                pass
+                        if pf:
+                            _progress_writer.write(pf, {'title': title, 'status': 'downloading', 'downloaded': int(received), 'total': int(total), 'speed': float(speed), 'eta': int(eta)})
 
                     try:
-                        out = download_video(stream, output_path, filename=_safe_filename(title), progress_callback=video_cb)
+                        # ranged multi-connection transfer; falls back to the
+                        # single-stream path when ranges aren't honored
+                        out = download_video_parallel(stream, output_path, filename=_safe_filename(title), progress_callback=video_cb)
                         if per_item_callback:
                             try:
                                 per_item_callback(title, 'completed', video_url, index, int(last_received['v']), 0, 0.0, 0.0)
                             except Exception:
                                 pass
-                        if progress_dir:
+                        if pf:
                             try:
-                                from progress_store import write_progress_file, progress_file_for_id
-                                pf = progress_file_for_id(output_path, f'playlist_{index}')
-                                write_progress_file(pf, {'title': title, 'status': 'completed', 'downloaded': int(last_received['v'])})
+                                _progress_writer.write(pf, {'title': title, 'status': 'completed', 'downloaded': int(last_received['v'])})
                             except Exception:
                                 pass
                         return out, title, 'ok'
                     except Exception:
                         # try yt-dlp for this single item if available
-                        if YTDLP_AVAILABLE:
+                        if has_yt_dlp():
                             def ytdlp_cb(fn, downloaded, total, speed, eta):
                                 if per_item_callback:
                                     try:
@@ -577,31 +1705,32 @@ def download_playlist(playlist_url: str, output_path: str,
                 attempts += 1
                 if attempts > max_retries:
                     return None, video_url, f'error:{e}'
-                # backoff
-                sleep_time = backoff_factor * (2 ** (attempts - 1))
-                time.sleep(sleep_time)
-
-    futures = []
+                # exponential backoff with jitter so pool workers don't
+                # retry in lockstep after a shared upstream hiccup; wait()
+                # instead of sleep() so cancel_all_downloads() interrupts it
+                sleep_time = backoff_factor * (2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+                if _shutdown_event.wait(sleep_time):
+                    return None, video_url, 'cancelled'
+
+    sem = threading.Semaphore(max(1, concurrency * 2))
     fut_map = {}
     with ThreadPoolExecutor(max_workers=concurrency) as ex:
         for i, video_url in enumerate(video_urls):
+            # bounded submission: never queue more than 2x the workers
+            sem.acquire()
             fut = ex.submit(_download_one, video_url, i)
-            futures.append(fut)
+            fut.add_done_callback(lambda _f: sem.release())
             fut_map[fut] = (video_url, i)
 
-        for fut in as_completed(futures):
+        for fut in as_completed(fut_map):
             out, title, status = fut.result()
-            meta = fut_map.get(fut, (None, None))
-            video_url_meta, index_meta = meta
+            video_url_meta, index_meta = fut_map.get(fut, (None, None))
             if per_item_callback:
                 try:
                     per_item_callback(title, status, video_url_meta, index_meta)
                 except Exception:
                     pass
-            if status == 'ok' and out:
-                downloaded.append(out)
-
-    return downloaded
+            yield out, title, status
 
 
 def _extract_playlist_urls(playlist_url: str) -> List[str]:
@@ -617,10 +1746,11 @@ def _extract_playlist_urls(playlist_url: str) -> List[str]:
         RuntimeError: If playlist cannot be parsed or no videos found
     """
     try:
+        Playlist = _init_pytube()[1]
         pl = Playlist(playlist_url)
         video_urls = pl.video_urls
     except Exception as e:
-        if not YTDLP_AVAILABLE:
+        if not has_yt_dlp():
             raise RuntimeError(
                 f'Could not parse playlist URL: {e}. '
                 'Install yt-dlp to enable fallback extraction.'
@@ -650,16 +1780,15 @@ def _extract_playlist_urls_with_ytdlp(playlist_url: str) -> List[str]:
     """
     ydl_opts = {'quiet': True, 'extract_flat': True}
     video_urls = []
-    
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(playlist_url, download=False)
-        entries = info.get('entries', [])
-        for entry in entries:
-            if isinstance(entry, dict):
-                url = entry.get('webpage_url') or entry.get('url')
-                if url:
-                    video_urls.append(url)
-    
+
+    info = _get_ydl(ydl_opts).extract_info(playlist_url, download=False)
+    entries = info.get('entries', [])
+    for entry in entries:
+        if isinstance(entry, dict):
+            url = entry.get('webpage_url') or entry.get('url')
+            if url:
+                video_urls.append(url)
+
     return video_urls
 
 
@@ -672,4 +1801,4 @@ def _safe_filename(title: str) -> str:
     Returns:
         Sanitized filename-safe string
     """
-    return "".join(c for c in title if c.isalnum() or c in SAFE_FILENAME_CHARS).strip()
+    return _UNSAFE_FILENAME_RE.sub('', title).strip()
@@ -3,21 +3,25 @@ import time
 import os
 from pathlib import Path
 
-# make sure the repository root is on sys.path so local imports work when run from scripts/
-repo_root = Path(__file__).resolve().parents[1]
-if str(repo_root) not in sys.path:
-    sys.path.insert(0, str(repo_root))
+if __name__ == '__main__':
+    # standalone run from scripts/: the repo root must be importable
+    # before the pytube_helper import below (pytest gets this from the
+    # top-level conftest.py instead)
+    _repo_root = str(Path(__file__).resolve().parents[1])
+    if _repo_root not in sys.path:
+        sys.path.insert(0, _repo_root)
 
 from pytube_helper import get_video_streams, download_video
 
 
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
 def human(n):
-    # simple bytes -> human
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if n < 1024.0:
-            return f"{n:3.1f}{unit}"
-        n /= 1024.0
-    return f"{n:.1f}TB"
+    # bytes -> human; one bit_length call picks the unit instead of a
+    # divide-per-unit loop
+    i = min((max(int(n), 1).bit_length() - 1) // 10, len(_UNITS) - 1)
+    return f"{n / (1 << (10 * i)):3.1f}{_UNITS[i]}"
 
 
 def download_with_progress(url, output_folder):
@@ -28,21 +32,43 @@ def download_with_progress(url, output_folder):
     stream = streams['progressive'][0] if streams['progressive'] else streams['adaptive_video'][0]
 
     start_time = None
+    last_emit = 0.0
+    last_flush = 0.0
+    total_h = None  # total never changes; format it once
+    _out = sys.stdout
+    _write = _out.write  # bound once; the callback runs in the hot path
 
     def progress_cb(received, total):
-        nonlocal start_time
-        now = time.time()
+        nonlocal start_time, last_emit, last_flush, total_h
+        # monotonic: immune to NTP/wall-clock jumps that would make the
+        # throttle misfire or the ETA go negative
+        now = time.monotonic()
         if start_time is None:
             start_time = now
+        # callbacks fire per chunk (thousands/sec on fast links); the
+        # terminal only needs ~10 updates/sec, but always show the end
+        if received < total and now - last_emit < 0.1:
+            return
+        last_emit = now
+        if total_h is None:
+            total_h = human(total)
         elapsed = max(now - start_time, 1e-6)
         pct = int(received / total * 100)
         speed = received / elapsed
         remaining = max(total - received, 0)
         eta = remaining / speed if speed > 0 else float('inf')
-        print(f"{pct}% — {human(received)} / {human(total)} — {human(speed)}/s — ETA {int(eta)}s", end='\r')
+        # single write, no print machinery; trailing spaces mask leftovers
+        # from a previously longer line
+        _write(f"\r{pct}% — {human(received)} / {total_h} — {human(speed)}/s — ETA {int(eta)}s  ")
+        # flush at ~2 Hz (or at the end) instead of per line, so a
+        # non-tty stdout doesn't turn every update into a syscall
+        if received >= total or now - last_flush >= 0.5:
+            last_flush = now
+            _out.flush()
 
-    # ensure output folder exists
-    os.makedirs(output_folder, exist_ok=True)
+    # ensure output folder exists; Path.mkdir avoids os.makedirs'
+    # Python-level path splitting on the happy path
+    Path(output_folder).mkdir(parents=True, exist_ok=True)
     out = download_video(stream, output_folder, progress_callback=progress_cb)
     print('\nDownload finished:', out)
 
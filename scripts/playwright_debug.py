@@ -1,35 +1,43 @@
 from playwright.sync_api import sync_playwright
-import time
+import os
+from pathlib import Path
 
 APP_URL = 'http://localhost:8501'
+# screenshot/HTML dumps are expensive; only produce them when asked for,
+# so using this script as a plain health check stays I/O-free
+DUMP = bool(os.getenv('PLAYWRIGHT_DEBUG'))
 
 with sync_playwright() as p:
     browser = p.chromium.launch(headless=False)
     context = browser.new_context()
     page = context.new_page()
-    page.goto(APP_URL)
-    time.sleep(2)
-    page.screenshot(path='scripts/screenshots/debug_initial.png')
-    html = page.content()
-    with open('scripts/screenshots/page.html', 'w', encoding='utf-8') as f:
-        f.write(html)
+    # wait for the app to actually render instead of a blind 2s sleep:
+    # faster on a warm app, and not flaky on a slow one
+    page.goto(APP_URL, wait_until='domcontentloaded')
+    page.wait_for_selector('input[type="text"]', timeout=15000)
+    if DUMP:
+        # create the artifacts dir only if we actually write into it
+        Path('scripts/screenshots').mkdir(parents=True, exist_ok=True)
+        page.screenshot(path='scripts/screenshots/debug_initial.jpg', type='jpeg', quality=60)
+        with open('scripts/screenshots/page.html', 'w', encoding='utf-8') as f:
+            f.write(page.content())
 
-    # Print button texts
-    buttons = page.query_selector_all('button')
-    texts = [b.inner_text() for b in buttons]
+    # Print button texts — one round-trip to the browser instead of one
+    # per element handle
+    texts = page.eval_on_selector_all('button', 'els => els.map(e => e.innerText)')
     print('Found buttons:')
     for t in texts:
         print('-', repr(t))
 
     # Also print visible text that matches 'Download'
-    download_texts = page.query_selector_all("xpath=//*[contains(text(), 'Download') or contains(text(), 'download') or contains(text(), 'Download video')]")
+    download_texts = page.eval_on_selector_all(
+        "xpath=//*[contains(text(), 'Download') or contains(text(), 'download')]",
+        'els => els.map(e => e.innerText)')
     print('\nDownload-like elements:')
-    for el in download_texts:
-        try:
-            print('-', el.inner_text())
-        except Exception:
-            print('-', '<unreadable>')
+    for t in download_texts:
+        print('-', t)
 
-    page.screenshot(path='scripts/screenshots/debug_buttons.png')
-    print('Screenshots and page html saved under scripts/screenshots/')
+    if DUMP:
+        page.screenshot(path='scripts/screenshots/debug_buttons.jpg', type='jpeg', quality=60)
+        print('Screenshots and page html saved under scripts/screenshots/')
     browser.close()
@@ -9,109 +9,137 @@ TEST_URL = 'https://youtu.be/-CpaiHzIRNc?si=OdbUScvmYnvPXUjf'
 # Decide headless mode: in CI we run headless. You can force headless by setting PLAYWRIGHT_HEADLESS=1
 HEADLESS = os.getenv('PLAYWRIGHT_HEADLESS') == '1' or os.getenv('CI') is not None
 
-def run_playwright_test():
-    screenshots_dir = Path('scripts') / 'screenshots'
-    screenshots_dir.mkdir(parents=True, exist_ok=True)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=HEADLESS)
-        context = browser.new_context()
-        page = context.new_page()
+def run_app_flow(page):
+    """Drive the download flow on an already-open page.
 
-        # Print console messages from the page to our stdout for debugging
-        def on_console(msg):
-            try:
-                print(f'PAGE LOG: {msg.type}: {msg.text}')
-            except Exception:
-                pass
-
-        page.on('console', on_console)
+    Accepting the page lets a pytest fixture supply one from a shared
+    browser, so repeated runs don't each pay a Chromium launch (~1-2s).
+    """
+    screenshots_dir = Path('scripts') / 'screenshots'
+    screenshots_dir.mkdir(parents=True, exist_ok=True)
 
-        page.goto(APP_URL)
-        # Wait for initial load (give Streamlit time to render)
+    # Print console messages from the page to our stdout for debugging
+    def on_console(msg):
         try:
-            page.wait_for_load_state('networkidle', timeout=60000)
+            print(f'PAGE LOG: {msg.type}: {msg.text}')
         except Exception:
-            # networkidle may not be reliable with Streamlit; fallback to a short sleep
-            time.sleep(2)
+            pass
 
-        # Fill URL (first text input is the video URL)
-        page.fill('input[type="text"]', TEST_URL)
-        time.sleep(0.5)
+    page.on('console', on_console)
+
+    page.goto(APP_URL)
+    # Wait for initial load (give Streamlit time to render)
+    try:
+        page.wait_for_load_state('networkidle', timeout=60000)
+    except Exception:
+        # networkidle may not be reliable with Streamlit; fallback to a short sleep
+        time.sleep(2)
+
+    # Fill URL (first text input is the video URL)
+    page.fill('input[type="text"]', TEST_URL)
+    time.sleep(0.5)
+
+    # Ensure "Show live progress" is checked: check() is idempotent (a
+    # no-op when already checked), so one call replaces the old
+    # is_checked round-trip plus conditional click
+    try:
+        page.check('text=Show live progress in UI', timeout=2000)
+    except Exception:
+        # checkbox absent or not actionable; it defaults to checked anyway
+        pass
+
+    # Click Start download
+    page.click('text=Start download')
+
+    # Wait for metadata/title to appear (the app writes a 'Title:' line or an info message)
+    # Wait longer for metadata to appear (Streamlit may take time to fetch)
+    try:
+        # wait up to 600s for metadata (600000 ms)
+        page.wait_for_selector('text=Title:', timeout=600000)
+        print('Metadata title appeared')
+    except Exception:
+        # fallback: wait for the yt-dlp info message
+        try:
+            # wait up to 600s for yt-dlp fallback metadata
+            page.wait_for_selector('text=Metadata fetched via yt-dlp', timeout=600000)
+            print('Metadata fetched via yt-dlp appeared')
+        except Exception as e:
+            print('Metadata did not appear before timeout:', e)
+            # capture page for debugging (jpeg: ~5-10x smaller/faster than png)
+            page.screenshot(path='scripts/screenshots/metadata_timeout.jpg', type='jpeg', quality=60)
+            with open('scripts/screenshots/page_metadata_timeout.html', 'w', encoding='utf-8') as f:
+                f.write(page.content())
 
-        # Ensure "Show live progress" is checked
+    # Take a screenshot after metadata phase (debug artifact only)
+    if os.getenv('CI_DEBUG'):
+        page.screenshot(path='scripts/screenshots/after_fetch.jpg', type='jpeg', quality=60)
+
+    # Try to find and click the download button
+    try:
+        # wait up to 600s for download button to appear
+        page.wait_for_selector('text=Download video now (yt-dlp)', timeout=600000)
+        page.click('text=Download video now (yt-dlp)')
+        print('Clicked Download video now (yt-dlp)')
+    except Exception as e:
+        print('Download button not found after metadata wait:', e)
+        # take a few diagnostic screenshots and save page HTML
+        page.screenshot(path='scripts/screenshots/not_found_after_fetch.jpg', type='jpeg', quality=60)
+        with open('scripts/screenshots/page_after_fetch.html', 'w', encoding='utf-8') as f:
+            f.write(page.content())
+        # also attempt to capture any textareas or visible UI sections;
+        # jpeg keeps the full-page rasterization from turning into a
+        # multi-MB synchronous PNG write
         try:
-            checkbox_locator = page.locator('text=Show live progress in UI')
-            if checkbox_locator.count() > 0:
-                # click if not checked
-                try:
-                    if not page.is_checked('text=Show live progress in UI'):
-                        checkbox_locator.click()
-                        time.sleep(0.2)
-                except Exception:
-                    # best-effort click
-                    try:
-                        checkbox_locator.click()
-                    except Exception:
-                        pass
+            page.screenshot(path='scripts/screenshots/not_found_after_fetch_2.jpg',
+                            full_page=True, type='jpeg', quality=60)
         except Exception:
-            # ignore if checkbox not found
             pass
+        raise
+
+    # Subscribe to the app's hidden #bdone byte marker with a
+    # MutationObserver: one event per progress emit, zero screenshot
+    # polling, and the promise resolves the moment the run terminates.
+    result = page.evaluate("""() => new Promise(resolve => {
+        let bytes = 0;
+        const finished = () => {
+            // match the texts app.py actually renders on completion/failure
+            const t = document.body.innerText;
+            return t.includes('Downloaded to:')
+                || t.includes('YT-DLP download failed')
+                || t.includes('Playlist error')
+                || t.includes('Error:');
+        };
+        const sample = () => {
+            const el = document.getElementById('bdone');
+            if (el) bytes = Number(el.getAttribute('data-bytes')) || bytes;
+        };
+        sample();
+        if (finished()) return resolve({state: 'done', bytes});
+        const obs = new MutationObserver(() => {
+            sample();
+            if (finished()) { obs.disconnect(); resolve({state: 'done', bytes}); }
+        });
+        obs.observe(document.body, {subtree: true, childList: true,
+                                    characterData: true, attributes: true});
+        setTimeout(() => { obs.disconnect(); resolve({state: 'timeout', bytes}); }, 600000);
+    })""")
+    print(f"Observer finished: {result['state']}, bytes seen: {result['bytes']}")
+
+    page.screenshot(path='scripts/screenshots/final.png')
+    print('Screenshots saved to scripts/screenshots/')
 
-        # Click Start download
-        page.click('text=Start download')
 
-        # Wait for metadata/title to appear (the app writes a 'Title:' line or an info message)
-        # Wait longer for metadata to appear (Streamlit may take time to fetch)
-        try:
-            # wait up to 600s for metadata (600000 ms)
-            page.wait_for_selector('text=Title:', timeout=600000)
-            print('Metadata title appeared')
-        except Exception:
-            # fallback: wait for the yt-dlp info message
-            try:
-                # wait up to 600s for yt-dlp fallback metadata
-                page.wait_for_selector('text=Metadata fetched via yt-dlp', timeout=600000)
-                print('Metadata fetched via yt-dlp appeared')
-            except Exception as e:
-                print('Metadata did not appear before timeout:', e)
-                # capture page for debugging
-                page.screenshot(path='scripts/screenshots/metadata_timeout.png')
-                with open('scripts/screenshots/page_metadata_timeout.html', 'w', encoding='utf-8') as f:
-                    f.write(page.content())
-
-        # Take a screenshot after metadata phase
-        page.screenshot(path='scripts/screenshots/after_fetch.png')
-
-        # Try to find and click the download button
+def run_playwright_test():
+    """Standalone entry point: launch a browser, run the flow, clean up."""
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=HEADLESS)
+        context = browser.new_context()
+        page = context.new_page()
         try:
-            # wait up to 600s for download button to appear
-            page.wait_for_selector('text=Download video now (yt-dlp)', timeout=600000)
-            page.click('text=Download video now (yt-dlp)')
-            print('Clicked Download video now (yt-dlp)')
-        except Exception as e:
-            print('Download button not found after metadata wait:', e)
-            # take a few diagnostic screenshots and save page HTML
-            page.screenshot(path='scripts/screenshots/not_found_after_fetch.png')
-            with open('scripts/screenshots/page_after_fetch.html', 'w', encoding='utf-8') as f:
-                f.write(page.content())
-            # also attempt to capture any textareas or visible UI sections
-            try:
-                page.screenshot(path='scripts/screenshots/not_found_after_fetch_2.png', full_page=True)
-            except Exception:
-                pass
+            run_app_flow(page)
+        finally:
             browser.close()
-            raise
-
-        # Capture live progress screenshots for up to 30s
-        # Capture live progress screenshots for up to ~600s, once every 2s (≈300 captures)
-        for i in range(300):
-            page.screenshot(path=f'scripts/screenshots/progress_{i:03d}.png')
-            time.sleep(2)
-
-        page.screenshot(path='scripts/screenshots/final.png')
-        print('Screenshots saved to scripts/screenshots/')
-        browser.close()
 
 
 if __name__ == '__main__':
@@ -1,11 +1,16 @@
 import os
 import sys
-# ensure repository root is on sys.path so local modules (pytube_helper) can be imported
-ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
+from pathlib import Path
 
-from pytube_helper import download_with_ytdlp
+if __name__ == '__main__':
+    # standalone run from scripts/: the repo root must be importable
+    # before the pytube_helper import below (pytest gets this from the
+    # top-level conftest.py instead)
+    ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+from pytube_helper import download_with_ytdlp, HTTP_SESSION
 
 if len(sys.argv) < 2:
     print('Usage: python run_ytdlp_download.py <url> [output_folder]')
@@ -13,10 +18,14 @@ if len(sys.argv) < 2:
 
 url = sys.argv[1]
 output = sys.argv[2] if len(sys.argv) >= 3 else os.path.join(os.getcwd(), 'downloads')
-os.makedirs(output, exist_ok=True)
+Path(output).mkdir(parents=True, exist_ok=True)
 print('Downloading to', output)
 try:
-    fname = download_with_ytdlp(url, output, audio_only=False, progress_callback=lambda f,r,t,s,e: print(f'DOWN {r}/{t} @ {s} ETA {e}'))
+    # reuse the helper's pooled session config (headers/proxies) rather
+    # than building a second pool in the script
+    fname = download_with_ytdlp(url, output, audio_only=False,
+                                progress_callback=lambda f,r,t,s,e: print(f'DOWN {r}/{t} @ {s} ETA {e}'),
+                                http_session=HTTP_SESSION)
     print('Done, file:', fname)
 except Exception as e:
     print('ERROR during download:', repr(e))
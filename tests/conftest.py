@@ -0,0 +1,35 @@
+"""Shared fixtures for the test suite.
+
+The browser fixtures amortize the Chromium launch (~1-2s per process)
+across every UI test in a session; playwright is imported lazily so the
+unit tests still run where it isn't installed.
+"""
+import os
+
+import pytest
+
+HEADLESS = os.getenv('PLAYWRIGHT_HEADLESS') == '1' or os.getenv('CI') is not None
+
+
+@pytest.fixture(scope='session')
+def browser():
+    playwright = pytest.importorskip('playwright.sync_api')
+    with playwright.sync_playwright() as p:
+        try:
+            b = p.chromium.launch(headless=HEADLESS)
+        except Exception as e:
+            pytest.skip(f'Chromium unavailable: {e}')
+        yield b
+        b.close()
+
+
+@pytest.fixture
+def context(browser):
+    ctx = browser.new_context()
+    yield ctx
+    ctx.close()
+
+
+@pytest.fixture
+def page(context):
+    return context.new_page()
@@ -0,0 +1,26 @@
+"""End-to-end UI test driving the Streamlit app through Playwright.
+
+Uses the session-scoped browser fixture from conftest.py, so multiple
+UI tests share one Chromium instance. Skipped when playwright is not
+installed or the app is not running on localhost:8501, keeping the
+unit suite self-contained.
+"""
+import socket
+
+import pytest
+
+
+def _app_running(host='localhost', port=8501):
+    try:
+        with socket.create_connection((host, port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+def test_download_flow(page):
+    """Drive the full download flow against a locally running app."""
+    if not _app_running():
+        pytest.skip('Streamlit app not running on localhost:8501')
+    from scripts.playwright_test import run_app_flow
+    run_app_flow(page)
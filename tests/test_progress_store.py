@@ -0,0 +1,41 @@
+"""Unit tests for the progress_store module."""
+import json
+import os
+
+from progress_store import (
+    progress_file_for_id, write_progress_file, read_progress_file,
+    list_progress_files,
+)
+
+
+def test_intermediate_update_roundtrip_without_file(tmp_path):
+    """Intermediate updates should be readable without touching the disk."""
+    pf = progress_file_for_id(str(tmp_path), 'abc123')
+    write_progress_file(pf, {'status': 'downloading', 'downloaded': 512, 'total': 2048})
+    info = read_progress_file(pf)
+    assert info.get('status') == 'downloading'
+    assert info.get('downloaded') == 512
+    assert info.get('total') == 2048
+
+
+def test_completed_state_persists(tmp_path):
+    """Terminal states must survive in the persistent store."""
+    pf = progress_file_for_id(str(tmp_path), 'done456')
+    write_progress_file(pf, {'status': 'downloading', 'downloaded': 1, 'total': 2})
+    write_progress_file(pf, {'status': 'completed', 'filename': 'out.mp4'})
+    info = read_progress_file(pf)
+    assert info['status'] == 'completed'
+    assert info['filename'] == 'out.mp4'
+    assert pf in list_progress_files(str(tmp_path))
+
+
+def test_list_progress_files_includes_active_downloads(tmp_path):
+    """Active (in-flight) downloads appear in the listing."""
+    pf = progress_file_for_id(str(tmp_path), 'active789')
+    write_progress_file(pf, {'status': 'downloading', 'downloaded': 10, 'total': 100})
+    assert pf in list_progress_files(str(tmp_path))
+
+
+def test_read_missing_progress_returns_empty(tmp_path):
+    pf = progress_file_for_id(str(tmp_path), 'nothing')
+    assert read_progress_file(pf) == {}
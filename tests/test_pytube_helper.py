@@ -4,70 +4,109 @@ import pytest
 from unittest import mock
 
 from pytube_helper import (
-    is_ffmpeg_available, _safe_filename, _normalize_video_url
+    is_ffmpeg_available, _ffmpeg_path, _safe_filename, _normalize_video_url,
+    download_video_parallel, _pooled_execute_request, SpeedTracker
 )
 
 
-def test_safe_filename_removes_bad_chars():
-    """Test that unsafe characters are removed from filenames."""
-    result = _safe_filename("Test: a/b\\c*")
-    assert '/' not in result and '\\' not in result
-    assert ':' not in result and '*' not in result
+class _FakeResponse:
+    def __init__(self, status_code, headers=None, body=b''):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
 
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self._body), chunk_size):
+            yield self._body[i:i + chunk_size]
 
-def test_safe_filename_keeps_safe_chars():
-    """Test that safe characters are preserved."""
-    result = _safe_filename("Test (2023) - Part 1_Final.mp4")
-    assert '(' in result and ')' in result
-    assert '-' in result and '_' in result
-    assert '.' in result
 
+class _FakeRangeSession:
+    """Minimal session serving a byte payload with Range support."""
 
-def test_safe_filename_strips_whitespace():
-    """Test that leading/trailing whitespace is removed."""
-    result = _safe_filename("  Test Video  ")
-    assert result == "Test Video"
+    def __init__(self, payload):
+        self.payload = payload
+
+    def head(self, url, **kwargs):
+        return _FakeResponse(200, {
+            'Content-Length': str(len(self.payload)),
+            'Accept-Ranges': 'bytes',
+        })
+
+    def get(self, url, headers=None, **kwargs):
+        start, end = (int(x) for x in headers['Range'].split('=')[1].split('-'))
+        return _FakeResponse(206, {}, self.payload[start:end + 1])
+
+
+@pytest.mark.parametrize("raw,expected", [
+    # unsafe characters are removed
+    ("Test: a/b\\c*", "Test abc"),
+    # safe characters survive untouched
+    ("Test (2023) - Part 1_Final.mp4", "Test (2023) - Part 1_Final.mp4"),
+    # leading/trailing whitespace is stripped
+    ("  Test Video  ", "Test Video"),
+])
+def test_safe_filename(raw, expected):
+    assert _safe_filename(raw) == expected
 
 
 def test_ffmpeg_check_returns_bool_by_mocking_shutil_which():
     """Ensure the function returns a bool and does not depend on the real PATH in CI."""
     with mock.patch('pytube_helper.shutil.which', return_value=None):
+        _ffmpeg_path.cache_clear()
         assert is_ffmpeg_available() is False
     with mock.patch('pytube_helper.shutil.which', return_value='C:\\ffmpeg\\bin\\ffmpeg.exe'):
+        _ffmpeg_path.cache_clear()
         assert is_ffmpeg_available() is True
-
-
-def test_normalize_video_url_standard():
-    """Test normalization of standard YouTube URLs."""
-    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-    result = _normalize_video_url(url)
-    assert result == url
-
-
-def test_normalize_video_url_with_extra_params():
-    """Test removal of extra query parameters."""
-    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&si=xyz&feature=share"
-    result = _normalize_video_url(url)
-    assert result == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-    assert "si=" not in result
-
-
-def test_normalize_video_url_youtu_be():
-    """Test normalization of youtu.be short URLs."""
-    url = "https://youtu.be/dQw4w9WgXcQ"
-    result = _normalize_video_url(url)
-    assert result == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-
-
-def test_normalize_video_url_shorts():
-    """Test normalization of YouTube Shorts URLs."""
-    url = "https://www.youtube.com/shorts/dQw4w9WgXcQ"
-    result = _normalize_video_url(url)
-    assert result == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-
-
-def test_normalize_video_url_invalid():
-    """Test that invalid URLs are returned unchanged."""
-    url = "not a valid url"
-    result = _normalize_video_url(url)
-    assert result == url
+    _ffmpeg_path.cache_clear()
+
+
+_CANONICAL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize("url,expected", [
+    # standard watch URL passes through unchanged
+    (_CANONICAL, _CANONICAL),
+    # extra query parameters are stripped
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ&si=xyz&feature=share", _CANONICAL),
+    # youtu.be short links are expanded
+    ("https://youtu.be/dQw4w9WgXcQ", _CANONICAL),
+    # Shorts URLs are rewritten to watch URLs
+    ("https://www.youtube.com/shorts/dQw4w9WgXcQ", _CANONICAL),
+    # unrecognized input is returned as-is
+    ("not a valid url", "not a valid url"),
+])
+def test_normalize_video_url(url, expected):
+    assert _normalize_video_url(url) == expected
+
+
+def test_pooled_execute_request_maps_errors_to_urllib():
+    """Non-2xx responses surface as the HTTPError pytube expects."""
+    import urllib.error
+    resp = mock.Mock(status_code=404, reason='Not Found', headers={}, content=b'')
+    with mock.patch('pytube_helper.HTTP_SESSION') as session:
+        session.request.return_value = resp
+        with pytest.raises(urllib.error.HTTPError):
+            _pooled_execute_request('https://www.youtube.com/watch?v=x')
+
+
+def test_speed_tracker_smooths_and_reports_eta():
+    """EWMA speed stays positive and ETA shrinks as bytes arrive."""
+    tracker = SpeedTracker()
+    with mock.patch('pytube_helper.time.monotonic_ns',
+                    side_effect=[0, 1_000_000_000, 2_000_000_000]):
+        fresh = SpeedTracker()
+        fresh.update(100)
+        speed = fresh.update(300)
+    assert speed > 0
+    assert tracker.eta(0, 100) == 0  # no speed sample yet
+
+
+def test_download_video_parallel_assembles_ranges(tmp_path):
+    """Parallel range downloads must reassemble the payload byte-for-byte."""
+    payload = bytes(range(256)) * 40
+    stream = mock.Mock(url='https://example.com/video', default_filename='clip.mp4')
+    out = download_video_parallel(stream, str(tmp_path), parts=4,
+                                  session=_FakeRangeSession(payload))
+    assert out.endswith('clip.mp4')
+    with open(out, 'rb') as f:
+        assert f.read() == payload